@@ -25,9 +25,15 @@ Madlib :
     Type 2 : "Correlation between <column1> & <column2> for each <grouping>
               where <filters> and <date-range>"
 
+    Type 3 : "Correlation between every pair of <columns> for each <grouping>
+              where <filters> and <date-range>"
+
 In Type 1 the result contains only 1 number as the result.
 And in Type 2 the result is a table and a correlation coefficient for each
 of the groupings.
+In Type 3 the result is the correlation matrix of the columns, a square
+table with a row & a column for every column, once for each of the
+groupings if the grouping is passed.
 
 Correlation value close to +1 means that the 2 variables move in the same
 direction with respect to their means. 
@@ -38,8 +44,17 @@ directions with respect to their means.
 Correlation value close to 0 means that the 2 columns are weakly correlated.
 """
 from util import aspects, oversights_order, rank_oversights
+import numpy
 import pandas
 
+# relative variance below which a column is taken as constant, as the
+# variance computed from the sums is not exactly 0 for constant columns
+_CONSTANT_COLUMN_TOLERANCE = 1e-12
+
+# number of products of the pairs of metrics held in memory at once,
+# while summing them for the groups, small enough to stay in the cache
+_GROUPED_SUMS_CHUNK_SIZE = 1 << 16
+
 def correlation(table, metric1, metric2, **kwargs):
     """ This function returns both the results according to the intent
     as well as the debiasing suggestions.
@@ -60,9 +75,10 @@ def correlation(table, metric1, metric2, **kwargs):
             Tuple of start_date and end_date
         date_column_name: Type-str
             It is the name of column which contains date
-        date_format: Type-str
-            It is required by datetime.strp_time to parse the date in the format
-            Format Codes -https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
+        day_first: Type-str
+            Day_first denotes that does day in the date occurs before month in the
+            dates in the date column
+            Example - '29-02-19', here day_first is true
         slices: Type-List of tuples
             Tuple represents the conditon to keep the row.
             (column_name, filter, value)
@@ -77,7 +93,7 @@ def correlation(table, metric1, metric2, **kwargs):
     """
     date_column_name = kwargs.get('date_column_name', 'date')
     date_range = kwargs.get('date_range', None)
-    date_format = kwargs.get('date_format', 'yyyy-mm-dd')
+    day_first = kwargs.get('day_first', False)
 
     slices = kwargs.get('slices', None)
 
@@ -87,7 +103,7 @@ def correlation(table, metric1, metric2, **kwargs):
                                          dimensions=dimensions,
                                          date_column_name=date_column_name,
                                          date_range=date_range,
-                                         date_format=date_format,
+                                         day_first=day_first,
                                          slices=slices)
 
     suggestions = []
@@ -103,6 +119,9 @@ def _correlation_results(table, metric1, metric2, **kwargs):
     """ This functions implements the correlation intent
 
     Uses the pandas corr() function to find the correlation coefficient.
+    If grouping is done, the correlation of every group is computed from
+    the number of rows and the sums of the metrics, their squares & their
+    product in the group, all the sums are found in one aggregation.
 
     If grouping is not done the result will be a single number - the
         correlation coefficient.
@@ -128,9 +147,10 @@ def _correlation_results(table, metric1, metric2, **kwargs):
             Tuple of start_date and end_date
         date_column_name: Type-str
             It is the name of column which contains date
-        date_format: Type-str
-            It is required by datetime.strp_time to parse the date in the format
-            Format Codes -https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
+        day_first: Type-str
+            Day_first denotes that does day in the date occurs before month in the
+            dates in the date column
+            Example - '29-02-19', here day_first is true
         slices: Type-List of tuples
             Tuple represents the conditon to keep the row.
             (column_name, filter, value)
@@ -140,13 +160,13 @@ def _correlation_results(table, metric1, metric2, **kwargs):
     """
     date_column_name = kwargs.get('date_column_name', 'date')
     date_range = kwargs.get('date_range', None)
-    date_format = kwargs.get('date_format', 'yyyy-mm-dd')
+    day_first = kwargs.get('day_first', False)
 
     slices = kwargs.get('slices', None)
 
     dimensions = kwargs.get('dimensions',None)
     
-    table = aspects.apply_date_range(table, date_range,date_column_name, date_format)
+    table = aspects.apply_date_range(table, date_range,date_column_name, day_first)
     
     table = aspects.slice_table(table, slices)
 
@@ -158,10 +178,296 @@ def _correlation_results(table, metric1, metric2, **kwargs):
         return result_table
     else:
         table = aspects.crop_other_columns(table, dimensions + [metric1, metric2])
-        table = table.groupby(dimensions).corr().reset_index()
-        table = aspects.crop_other_columns(table, dimensions + [metric1])
-        table = table.rename(columns={metric1:correlation_col})
-        table = table.groupby(dimensions).min()
-        table = table.reset_index()
+
+        # only the rows in which both the metrics are present are used
+        metric1_values = table[metric1].astype(float)
+        metric2_values = table[metric2].astype(float)
+        present = metric1_values.notna() & metric2_values.notna()
+        metric1_values = metric1_values.where(present)
+        metric2_values = metric2_values.where(present)
+
+        # shifting a column does not change the correlation, the columns are
+        # centered on the mean of every group so that the sums of products
+        # do not lose precision, even if the groups are at different levels
+        group_keys = [table[dimension] for dimension in dimensions]
+        metric1_values = metric1_values - metric1_values.groupby(group_keys).transform('mean')
+        metric2_values = metric2_values - metric2_values.groupby(group_keys).transform('mean')
+
+        # the sums needed by the correlation of every group, in one aggregation
+        sums_table = table[dimensions].assign(num_rows=present.astype(int),
+                                              sum_x=metric1_values,
+                                              sum_y=metric2_values,
+                                              sum_xx=metric1_values * metric1_values,
+                                              sum_yy=metric2_values * metric2_values,
+                                              sum_xy=metric1_values * metric2_values)
+        sums_table = sums_table.groupby(dimensions).sum()
+
+        correlation = _pearson_correlation(sums_table['num_rows'].values,
+                                           sums_table['sum_x'].values,
+                                           sums_table['sum_y'].values,
+                                           sums_table['sum_xx'].values,
+                                           sums_table['sum_yy'].values,
+                                           sums_table['sum_xy'].values)
+
+        table = sums_table.index.to_frame(index=False)
+        table[correlation_col] = correlation
 
         return table
+
+def correlation_matrix(table, metrics, **kwargs):
+    """ This function returns the correlation between every pair of the
+    metrics as well as the debiasing suggestions.
+    Currently no oversight is implemented.
+
+    The correlations of all the pairs are computed together from the sums
+    of the products of the columns, i.e. in a single covariance pass over
+    the table, the sums of all the groups are computed together if the
+    grouping is done. Like pandas corr(), the correlation of a pair uses
+    the rows in which both the metrics are present.
+
+    Args :
+        table: Type-pandas.dataframe
+            It has the contents of the table in sheets
+        metrics : Type-list of str
+            The columns between every pair of which the correlation is found
+        dimensions: Type-list of str
+            It the list of columns according to which groups are formed
+            If these are passed we calculate the correlation matrix for
+            each group
+        date_range: Type-tuple
+            Tuple of start_date and end_date
+        date_column_name: Type-str
+            It is the name of column which contains date
+        day_first: Type-str
+            Day_first denotes that does day in the date occurs before month in the
+            dates in the date column
+            Example - '29-02-19', here day_first is true
+        slices: Type-List of tuples
+            Tuple represents the conditon to keep the row.
+            (column_name, filter, value)
+            column_name - is the value of the column that the
+            condition is applied upon.
+            filter - Filters enum members, ex. Filters.IN
+    Returns:
+        The function will return both suggestions and the results in a tuple.
+        (results, suggestions)
+        results: Type - pandas dataframe, a row for every metric(for every
+            group) with the columns - the dimensions, 'metric' & the metrics
+        suggestions: Type - List of strings, List of suggestions.
+    """
+    date_column_name = kwargs.get('date_column_name', 'date')
+    date_range = kwargs.get('date_range', None)
+    day_first = kwargs.get('day_first', False)
+
+    slices = kwargs.get('slices', None)
+
+    dimensions = kwargs.get('dimensions',None)
+
+    table = aspects.apply_date_range(table, date_range, date_column_name, day_first)
+
+    table = aspects.slice_table(table, slices)
+
+    values = table[metrics].to_numpy(dtype=float)
+
+    if dimensions is None:
+        result_table = pandas.DataFrame(_correlation_matrix(values), columns=metrics)
+        result_table.insert(0, 'metric', metrics)
+    else:
+        grouped = table.groupby(dimensions)
+
+        # the rows of every group one after the other, groups in sorted order,
+        # the rows with a missing dimension are in no group(-1)
+        group_numbers = grouped.ngroup().fillna(-1).values.astype(int)
+        rows_in_order = numpy.argsort(group_numbers, kind='stable')
+        rows_in_order = rows_in_order[group_numbers[rows_in_order] >= 0]
+
+        correlations = _grouped_correlation_matrices(values[rows_in_order],
+                                                     group_numbers[rows_in_order],
+                                                     grouped.ngroups)
+
+        result_table = grouped.size().index.to_frame(index=False)
+        result_table = result_table.loc[result_table.index.repeat(len(metrics))]
+        result_table = result_table.reset_index(drop=True)
+        result_table['metric'] = numpy.tile(metrics, grouped.ngroups)
+        result_table[metrics] = correlations.reshape(-1, len(metrics))
+
+    suggestions = []
+
+    order = oversights_order.ORDER_IN_CORRELATION
+
+    suggestions = rank_oversights.rank_oversights(suggestions, order)
+
+    return (result_table, suggestions)
+
+def _correlation_matrix(values):
+    """ This function returns the Pearson correlation coefficient of every
+    pair of the columns of values, using the rows in which both the
+    columns are present(not NaN).
+
+    Args :
+        values: Type-numpy.ndarray of float, one column for every metric
+    Returns:
+        The correlation matrix, Type-numpy.ndarray of float
+    """
+    present = ~numpy.isnan(values)
+
+    # shifting a column does not change its correlations, the columns are
+    # centered so that the sums of products do not lose precision
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        means = numpy.where(present, values, 0).sum(axis=0) / present.sum(axis=0)
+    values = numpy.where(present, values - means, 0)
+    present = present.astype(float)
+
+    # [i, j] entries are the sums over the rows in which both i & j are present
+    num_rows = present.T @ present
+    sum_x = values.T @ present
+    sum_xx = (values * values).T @ present
+    sum_xy = values.T @ values
+
+    return _correlation_from_sums(num_rows, sum_x, sum_xx, sum_xy)
+
+def _grouped_correlation_matrices(values, group_numbers, num_groups):
+    """ This function returns the correlation matrix of the columns of values
+    for every group, like _correlation_matrix. The sums of products of all
+    the groups are computed together - the products of every pair of columns
+    are laid side by side for all the rows and summed for every group at once.
+
+    Args :
+        values: Type-numpy.ndarray of float, one column for every metric
+            The rows of every group one after the other
+        group_numbers: Type-numpy.ndarray of int
+            The group of every row, in increasing order from 0
+        num_groups: Type-int
+            Number of groups, every group has at least one row
+    Returns:
+        The correlation matrices, Type-numpy.ndarray of float of
+        shape (num_groups, number of columns, number of columns)
+    """
+    num_columns = values.shape[1]
+    if num_groups == 0:
+        return numpy.zeros((0, num_columns, num_columns))
+
+    present = ~numpy.isnan(values)
+    has_missing = not present.all()
+    group_starts = numpy.flatnonzero(numpy.diff(group_numbers, prepend=-1))
+
+    # the columns are centered on the mean of their group
+    values = numpy.where(present, values, 0)
+    present = present.astype(float)
+    column_counts = numpy.add.reduceat(present, group_starts)
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        means = numpy.add.reduceat(values, group_starts) / column_counts
+    values = numpy.where(present > 0, values - means[group_numbers], 0)
+
+    # the sums of x_i * x_j & of present_i * present_j are symmetric,
+    # so only the pairs i <= j are summed
+    pair_i, pair_j = numpy.triu_indices(num_columns)
+    num_pairs = len(pair_i)
+    num_products = num_pairs
+    if has_missing:
+        num_products += num_pairs + 2 * num_columns * num_columns
+
+    # the rows are taken in chunks to bound the memory of the products,
+    # the products of a pair of columns are kept in a row(not a column) of
+    # the array, so that they are contiguous while being summed
+    columns = numpy.ascontiguousarray(values.T)
+    columns_present = numpy.ascontiguousarray(present.T)
+    pair_sums = numpy.zeros((num_products, num_groups))
+    chunk_size = max(1, _GROUPED_SUMS_CHUNK_SIZE // num_products)
+    for chunk_start in range(0, values.shape[0], chunk_size):
+        chunk = slice(chunk_start, chunk_start + chunk_size)
+        chunk_values = columns[:, chunk]
+
+        products = [chunk_values[pair_i] * chunk_values[pair_j]]
+        if has_missing:
+            chunk_present = columns_present[:, chunk]
+            products.append(chunk_present[pair_i] * chunk_present[pair_j])
+            products.append((chunk_values[:, numpy.newaxis] *
+                             chunk_present[numpy.newaxis]).reshape(num_columns ** 2, -1))
+            products.append(((chunk_values * chunk_values)[:, numpy.newaxis] *
+                             chunk_present[numpy.newaxis]).reshape(num_columns ** 2, -1))
+        products = numpy.concatenate(products)
+
+        chunk_groups = group_numbers[chunk]
+        chunk_group_starts = numpy.flatnonzero(numpy.diff(chunk_groups, prepend=-1))
+        pair_sums[:, chunk_groups[chunk_group_starts]] += numpy.add.reduceat(
+            products, chunk_group_starts, axis=1)
+    pair_sums = pair_sums.T
+
+    sum_xy = _symmetric_matrices(pair_sums[:, :num_pairs], num_columns)
+    if has_missing:
+        num_rows = _symmetric_matrices(pair_sums[:, num_pairs:2 * num_pairs], num_columns)
+        sums_over_present = pair_sums[:, 2 * num_pairs:].reshape(num_groups, 2,
+                                                                 num_columns, num_columns)
+        sum_x = sums_over_present[:, 0]
+        sum_xx = sums_over_present[:, 1]
+    else:
+        # every column is present in every row, the sums over the rows in
+        # which both i & j are present are the sums of the column i
+        square_shape = (num_groups, num_columns, num_columns)
+        num_rows = numpy.broadcast_to(column_counts[:, :, numpy.newaxis], square_shape)
+        sum_x = numpy.broadcast_to(numpy.add.reduceat(values, group_starts)[:, :, numpy.newaxis],
+                                   square_shape)
+        sum_xx = numpy.broadcast_to(numpy.diagonal(sum_xy, axis1=1, axis2=2)[:, :, numpy.newaxis],
+                                    square_shape)
+
+    return _correlation_from_sums(num_rows, sum_x, sum_xx, sum_xy)
+
+def _symmetric_matrices(sums_of_pairs, num_columns):
+    """ This function returns the symmetric matrices from the sums of the
+    pairs i <= j(in the order of numpy.triu_indices), one for every group.
+    """
+    pair_i, pair_j = numpy.triu_indices(num_columns)
+    matrices = numpy.empty((sums_of_pairs.shape[0], num_columns, num_columns))
+    matrices[:, pair_i, pair_j] = sums_of_pairs
+    matrices[:, pair_j, pair_i] = sums_of_pairs
+    return matrices
+
+def _correlation_from_sums(num_rows, sum_x, sum_xx, sum_xy):
+    """ This function returns the correlation matrices from the sums of the
+    pairs of columns, entry [i, j] of every sum being taken over the rows in
+    which both i & j are present.
+
+    Args :
+        num_rows, sum_x, sum_xx, sum_xy: Type-numpy.ndarray of float
+            Square matrices, or a stack of them(one for each group) with
+            the matrix in the last 2 axes
+    Returns:
+        The correlation matrices, Type-numpy.ndarray of float
+    """
+    correlation = _pearson_correlation(num_rows, sum_x, numpy.swapaxes(sum_x, -1, -2),
+                                       sum_xx, numpy.swapaxes(sum_xx, -1, -2), sum_xy)
+
+    # a column is fully correlated with itself, without the rounding errors
+    diagonal = numpy.arange(correlation.shape[-1])
+    correlation[..., diagonal, diagonal] = numpy.where(
+        numpy.isnan(correlation[..., diagonal, diagonal]), numpy.nan, 1)
+
+    return correlation
+
+def _pearson_correlation(num_rows, sum_x, sum_y, sum_xx, sum_yy, sum_xy):
+    """ This function returns the Pearson correlation coefficient from the
+    number of rows and the sums of the 2 columns, their squares & their
+    product. It is NaN if one of the columns has no variance.
+
+    Args :
+        num_rows, sum_x, sum_y, sum_xx, sum_yy, sum_xy: Type-numpy.ndarray
+            The arrays are of the same shape, one correlation is
+            computed for every entry
+    Returns:
+        The correlations, Type-numpy.ndarray of float
+    """
+    covariance = num_rows * sum_xy - sum_x * sum_y
+    variance_x = num_rows * sum_xx - sum_x * sum_x
+    variance_y = num_rows * sum_yy - sum_y * sum_y
+
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        correlation = covariance / numpy.sqrt(variance_x * variance_y)
+
+    # the variance of a constant column is left with a rounding error
+    # relative to the sum of squares instead of being 0
+    is_constant = (variance_x <= _CONSTANT_COLUMN_TOLERANCE * num_rows * sum_xx) | \
+                  (variance_y <= _CONSTANT_COLUMN_TOLERANCE * num_rows * sum_yy)
+    correlation[is_constant] = numpy.nan
+
+    return numpy.clip(correlation, -1, 1)
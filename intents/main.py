@@ -22,9 +22,15 @@ It returns the result of the intent and also the list of suggestions.
 import json, pandas, enum, topk, slice_compare, correlation, trend, time_compare
 from flask import escape
 from show import show
-from util import enums, insert_as_column
+from util import column_profile, dataset_cache, enums, insert_as_column, result_cache
 from oversights import wrong_points
 
+# Number of processes computing the drill-down groupings of the
+# slice-compare & time-compare oversights. It is a setting of the server,
+# shared by all the requests, 1 computes them in the process serving the
+# request. More processes than the cores of the server only add overhead.
+OVERSIGHT_WORKERS = 1
+
 # ToDo : Change the name hello_http (default name on GCP) to a better name
 # that makes sense of the function & also make changes in the UI javascript
 
@@ -56,20 +62,59 @@ def hello_http(request):
     time_comparision_arg = _get_value(request_json, 'compareDateRange')
     date = _get_value(request_json, 'dateRange')
     time_granularity = _get_value(request_json, 'timeGranularity')
+    fill_value = _get_value(request_json, 'fillValue')
+    smoothing = _get_value(request_json, 'smoothing')
+    smoothing_window = _get_value(request_json, 'smoothingWindow')
+    pivot = _get_value(request_json, 'pivot')
+    max_points = _get_value(request_json, 'maxPoints')
     correlation_metrics = _get_value(request_json, 'correlationMetrics')
     rangeA1Notation = _get_value(request_json, 'rangeA1Notation')
+    dataset_handle = _get_value(request_json, 'datasetHandle')
+    date_columns = _get_value(request_json, 'dateColumns')
+
+    table_fingerprint = dataset_handle
+    if table is not None:
+        table_fingerprint = dataset_cache.dataset_handle(table)
+
+    # The response is cached against the query and the table queried,
+    # the key is computed before the intents update the request json.
+    result_cache_key = None
+    if intent != 'register_dataset' and table_fingerprint is not None:
+        result_cache_key = result_cache.request_key(request_json, table_fingerprint)
+        cached_response = result_cache.get(result_cache_key)
+        if cached_response is not None:
+            return cached_response
+
+    if table is not None:
+        # Converting the table passed into a pandas dataframe, it can either be
+        # a list of rows or a dictionary holding one list per column.
+        (query_table_dataframe, table_header) = _table_to_dataframe(table)
+        table_profile = column_profile.profile_columns(query_table_dataframe)
+
+        # The registered table is kept in the cache, & only its handle is
+        # returned, which is passed instead of the table in later requests.
+        if intent == 'register_dataset':
+            dataset_handle = table_fingerprint
+            dataset_cache.put(dataset_handle, query_table_dataframe,
+                              table_header=table_header,
+                              column_profile=table_profile,
+                              date_columns=date_columns)
+            return json.dumps({'datasetHandle' : dataset_handle})
+
+    elif dataset_handle is not None:
+        dataset = dataset_cache.get(dataset_handle)
+        if dataset is None:
+            raise Exception("Dataset handle not found, the table must be registered again")
+        query_table_dataframe = dataset['table']
+        table_header = dataset['table_header']
+        table_profile = dataset['column_profile']
+        if date_columns is None:
+            date_columns = dataset['date_columns']
 
+    else:
+        raise Exception("Either the table or the dataset handle must be passed")
 
-
-    # Converting the list of list into a pandas dataframe.
-    query_table = []
-    for row in range(1, len(table)):
-        if row != 0:
-            query_table.append(table[row])
-    query_table_dataframe = pandas.DataFrame(query_table,
-                                             columns=table[0])
-
-    (all_dimensions, all_metrics) = _list_all_dimensions_metrics(query_table_dataframe,
+    (all_dimensions, all_metrics) = _list_all_dimensions_metrics(table_profile,
                                                                  dimensions, metric)
 
     # Remove empty columns
@@ -84,7 +129,6 @@ def hello_http(request):
     date_range = None
     day_first = None
     if date != None:
-        date_columns = request_json['dateColumns']
         date_column_name = date['dateCol']
         date_range = (date['dateStart'], date['dateEnd'])
         day_first = date_columns[date_column_name]['day_first']
@@ -105,16 +149,41 @@ def hello_http(request):
 
     if slice_comparision_arg is not None:
         slice_compare_column = slice_comparision_arg['comparisonColumn']
-        slice1 = slice_comparision_arg['slice1']
-        slice2 = slice_comparision_arg['slice2']
+
+        # any number of slices can be compared by passing the list
+        # of slices, instead of slice1 & slice2
+        if 'sliceValues' in slice_comparision_arg.keys():
+            compared_slice_values = slice_comparision_arg['sliceValues']
+            if len(compared_slice_values) < 2:
+                raise Exception('At least 2 slices are required for slice compare')
+        else:
+            compared_slice_values = [slice_comparision_arg['slice1'],
+                                     slice_comparision_arg['slice2']]
+
+        slice1 = compared_slice_values[0]
+        slice2 = compared_slice_values[1]
 
     if time_comparision_arg is not None:
         time_compare_column = time_comparision_arg['dateCol']
-        date_range1 = (time_comparision_arg['dateStart1'],
-                       time_comparision_arg['dateEnd1'])
-        date_range2 = (time_comparision_arg['dateStart2'],
-                       time_comparision_arg['dateEnd2'])
-        day_first = request_json['dateColumns'][time_compare_column]['day_first']
+
+        # any number of date ranges can be compared by passing the list
+        # of date ranges, instead of the 2 date ranges
+        if 'dateRanges' in time_comparision_arg.keys():
+            compared_date_ranges = []
+            for compared_date_range in time_comparision_arg['dateRanges']:
+                compared_date_ranges.append((compared_date_range['dateStart'],
+                                             compared_date_range['dateEnd']))
+            if len(compared_date_ranges) < 2:
+                raise Exception('At least 2 date ranges are required for time compare')
+        else:
+            compared_date_ranges = [(time_comparision_arg['dateStart1'],
+                                     time_comparision_arg['dateEnd1']),
+                                    (time_comparision_arg['dateStart2'],
+                                     time_comparision_arg['dateEnd2'])]
+
+        date_range1 = compared_date_ranges[0]
+        date_range2 = compared_date_ranges[1]
+        day_first = date_columns[time_compare_column]['day_first']
 
     if metric == 'null':
         metric = None
@@ -123,8 +192,20 @@ def hello_http(request):
 
     time_granularity = _str_to_time_granularity_enum(time_granularity)
 
+    if smoothing is not None:
+        smoothing = [_str_to_smoothing_enum(smoothing_operator)
+                     for smoothing_operator in smoothing]
+
+    if smoothing_window is None:
+        smoothing_window = 3
+
+    if pivot is None:
+        pivot = True
+
     suggestions = []
 
+    original_points = None
+
     wrong_points_suggestion = wrong_points.wrong_points(query_table_dataframe)
 
     if intent == 'show':
@@ -184,7 +265,9 @@ def hello_http(request):
                                                    date_range=date_range,
                                                    day_first = day_first,
                                                    slices=slices_list,
-                                                   dimensions = dimensions
+                                                   dimensions = dimensions,
+                                                   slice_values = compared_slice_values[2:],
+                                                   workers = OVERSIGHT_WORKERS
                                                    )
         query_table_dataframe = query_result[0]
         suggestions = query_result[1]
@@ -206,7 +289,9 @@ def hello_http(request):
                                                  date_range1, date_range2,
                                                  day_first, summary_operator,
                                                  slices=slices_list,
-                                                 dimensions = dimensions
+                                                 dimensions = dimensions,
+                                                 date_ranges = compared_date_ranges[2:],
+                                                 workers = OVERSIGHT_WORKERS
                                                  )
         query_table_dataframe = query_result[0]
         suggestions = query_result[1]
@@ -222,26 +307,77 @@ def hello_http(request):
         suggestions = updated_suggestions
 
     elif intent == 'correlation':
-        query_table_dataframe = correlation.correlation(query_table_dataframe,
-                                                        correlation_metrics['metric1'],
-                                                        correlation_metrics['metric2'],
-                                                        slices=slices_list,
-                                                        date_column_name=date_column_name,
-                                                        day_first=day_first,
-                                                        date_range=date_range,
-                                                        dimensions=dimensions
-                                                        )
+        # in the matrix mode the correlation is found between every pair
+        # of the metrics passed, or of all the metrics if none are passed
+        if correlation_metrics.get('matrix', False):
+            correlation_metric_list = correlation_metrics.get('metrics', None)
+            if correlation_metric_list is None:
+                correlation_metric_list = all_metrics
+
+            query_result = correlation.correlation_matrix(query_table_dataframe,
+                                                          correlation_metric_list,
+                                                          slices=slices_list,
+                                                          date_column_name=date_column_name,
+                                                          day_first=day_first,
+                                                          date_range=date_range,
+                                                          dimensions=dimensions
+                                                          )
+        else:
+            query_result = correlation.correlation(query_table_dataframe,
+                                                   correlation_metrics['metric1'],
+                                                   correlation_metrics['metric2'],
+                                                   slices=slices_list,
+                                                   date_column_name=date_column_name,
+                                                   day_first=day_first,
+                                                   date_range=date_range,
+                                                   dimensions=dimensions
+                                                   )
+        query_table_dataframe = query_result[0]
+        suggestions = query_result[1]
 
     elif intent == 'trend':
-        query_table_dataframe = trend.trend(query_table_dataframe,
-                                            metric,
-                                            time_granularity,
-                                            summary_operator,
-                                            date_column_name=date_column_name,
-                                            day_first=day_first,
-                                            date_range=date_range,
-                                            slices=slices_list
-                                            )
+        query_result = trend.trend(query_table_dataframe,
+                                   metric,
+                                   time_granularity,
+                                   summary_operator,
+                                   date_column_name=date_column_name,
+                                   day_first=day_first,
+                                   date_range=date_range,
+                                   slices=slices_list,
+                                   fill_value=fill_value,
+                                   smoothing=smoothing,
+                                   window=smoothing_window,
+                                   dimensions=dimensions,
+                                   pivot=pivot
+                                   )
+        query_table_dataframe = query_result[0]
+        suggestions = query_result[1]
+
+        # maxPoints limits the points of every series, i.e. the rows of the
+        # wide table, the long table keeps up to maxPoints rows per series.
+        # The number of points of a series before downsampling(the number
+        # of periods) is sent along with the downsampled results
+        if max_points is not None:
+            original_points = int(query_table_dataframe[date_column_name].nunique())
+            query_result = trend.downsample_results(query_table_dataframe, suggestions,
+                                                    metric, max_points,
+                                                    date_column_name=date_column_name,
+                                                    dimensions=dimensions,
+                                                    pivot=pivot,
+                                                    smoothing=smoothing,
+                                                    summary_operator=summary_operator)
+            query_table_dataframe = query_result[0]
+            suggestions = query_result[1]
+        updated_suggestions = []
+
+        for suggestion in suggestions:
+            updated_suggestion = suggestion
+            if 'change_list' in suggestion.keys():
+                updated_suggestion['json'] = func(request_json, suggestion['change_list'])
+            updated_suggestion['oversight'] = updated_suggestion['oversight'].name
+            updated_suggestions.append(updated_suggestion)
+
+        suggestions = updated_suggestions
 
     else:
         raise Exception("Intent name does not match")
@@ -261,10 +397,13 @@ def hello_http(request):
 
     json_ret = {'outputTable' : final_table, 'suggestions' : suggestions}
 
+    if original_points is not None:
+        json_ret['originalPoints'] = original_points
+
     if rangeA1Notation is not None :
         all_row_labels = _get_all_row_labels(rangeA1Notation)
         all_column_labels = _get_all_column_labels(rangeA1Notation)
-        cheader_to_clabel = _get_cheader_to_clabel(table, all_column_labels)
+        cheader_to_clabel = _get_cheader_to_clabel(table_header, all_column_labels)
 
         if slices_list is not None:
             json_ret['slicing_passed_list'] = insert_as_column.insert_as_column_show(table, cheader_to_clabel, all_row_labels[0], all_row_labels[-1], all_column_labels[0], all_column_labels[-1], slices=slices_list)
@@ -276,6 +415,10 @@ def hello_http(request):
             json_ret['list_topk_indices'] = insert_as_column.insert_as_column_topk_column(table, cheader_to_clabel, all_row_labels[0], all_row_labels[-1], all_column_labels[0], all_column_labels[-1], filter_column_label, metric, is_asc, k)
 
     json_string = json.dumps(json_ret)
+
+    if result_cache_key is not None:
+        result_cache.put(result_cache_key, json_string)
+
     return json_string
 
 
@@ -363,6 +506,10 @@ def _str_to_time_granularity_enum(time_granularity):
         return enums.Granularities.ANNUALLY
     elif time_granularity == 'Monthly':
         return enums.Granularities.MONTHLY
+    elif time_granularity == 'Quarterly':
+        return enums.Granularities.QUARTERLY
+    elif time_granularity == 'Weekly':
+        return enums.Granularities.WEEKLY
     elif time_granularity == 'Daily':
         return enums.Granularities.DAILY
     elif time_granularity == 'Hourly':
@@ -372,6 +519,25 @@ def _str_to_time_granularity_enum(time_granularity):
     else:
         raise Exception('Granularity not supported')
 
+def _str_to_smoothing_enum(smoothing_operator):
+    """
+    This function return the corresponding enum to the
+    smoothing passed.
+
+    Args:
+        smoothing_operator : Type-str
+    Returns:
+        Smoothings enum member
+    """
+    if smoothing_operator == 'Rolling mean':
+        return enums.Smoothings.ROLLING_MEAN
+    elif smoothing_operator == 'Rolling sum':
+        return enums.Smoothings.ROLLING_SUM
+    elif smoothing_operator == 'Cumulative sum':
+        return enums.Smoothings.CUMULATIVE_SUM
+    else:
+        raise Exception('Smoothing not supported')
+
 def func(inp_json, change_list):
     for key in change_list.keys():
         inp_json[key] = change_list[key]
@@ -396,6 +562,91 @@ def remove_duplicate_named_columns(query_table_dataframe):
     query_table_dataframe = query_table_dataframe.loc[:,~query_table_dataframe.columns.duplicated()]
     return query_table_dataframe    
 
+def _table_to_dataframe(table):
+    """
+    This function converts the table passed in the request json
+    into a pandas dataframe.
+
+    Two formats of the table are supported -
+    1. Row-major, list of rows where the first row is the header.
+        Example - [['name', 'runs'], ['A', 10], ['B', 20]]
+    2. Column-major, dictionary with the header and one list per column.
+        Optionally 'types' gives the declared type of each column,
+        one of 'number', 'string', 'boolean' or None(no conversion).
+        Example - {'header': ['name', 'runs'],
+                   'columns': [['A', 'B'], [10, 20]],
+                   'types': ['string', 'number']}
+    The column-major format is built directly from the column lists,
+    without copying the sheet row by row.
+
+    Args:
+        table: Type-list of lists or dictionary
+            The table in one of the formats above.
+    Returns:
+        Tuple of the pandas dataframe and the list of column headers
+    """
+    if not isinstance(table, dict):
+        query_table_dataframe = pandas.DataFrame(table[1:], columns=table[0])
+        return (query_table_dataframe, table[0])
+
+    table_header = table['header']
+    columns = table['columns']
+    types = table.get('types', None)
+    if types is None:
+        types = [None] * len(columns)
+
+    # positions are used as keys, as the header may contain
+    # duplicate names which are removed later
+    column_series = {}
+    for position in range(len(columns)):
+        column_series[position] = _to_declared_type(pandas.Series(columns[position]),
+                                                    types[position])
+
+    query_table_dataframe = pandas.DataFrame(column_series)
+    query_table_dataframe.columns = table_header
+
+    return (query_table_dataframe, table_header)
+
+def _to_declared_type(column, declared_type):
+    """
+    This function converts the column to the type declared
+    by the client for it.
+    Empty cells of a number column become NaN.
+    Missing(None) cells of a string column stay missing,
+    empty strings are kept as values.
+    A boolean column holds true/false strings(in any case) or booleans,
+    its empty cells become pandas.NA.
+
+    Args:
+        column: Type-pandas Series
+        declared_type: Type-str
+            one of 'number', 'string', 'boolean' or None
+    Returns:
+        The converted pandas Series
+    """
+    if declared_type == 'number':
+        return pandas.to_numeric(column, errors='coerce')
+    elif declared_type == 'string':
+        return column.astype(str).where(column.notna())
+    elif declared_type == 'boolean':
+        values = [_to_boolean(value) for value in column]
+        return pandas.Series(pandas.array(values, dtype='boolean'), index=column.index)
+    elif declared_type == None:
+        return column
+    else:
+        raise Exception('Column type not supported')
+
+def _to_boolean(value):
+    """
+    Returns the boolean for a cell of a boolean column,
+    pandas.NA for an empty cell or a value that is not a boolean.
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return {'true': True, 'false': False}.get(value.strip().lower(), pandas.NA)
+    return pandas.NA
+
 def _get_value(dict, key):
     """
     Returns the value for corresponding key. If key is not present return None
@@ -421,20 +672,20 @@ def get_hardcoded_mean_vs_median_suggestion():
 
     return suggestion
 
-def _list_all_dimensions_metrics(table, dimensions, metric):
+def _list_all_dimensions_metrics(table_profile, dimensions, metric):
     """
     This function return a tuple of all_dimensions and all_metrics
 
     Args:
-        table: Type-pandan DataFrame
+        table_profile: Type-list of dictionaries
+            Profile of the columns of the table, as returned by
+            column_profile.profile_columns
         dimensions: Type-list of strings
         metric: string
     Returns:
         Tuple of all_dimensions and all_metrics
     """
 
-    num_rows = table.shape[0]
-
     all_dimensions = []
     all_metrics = []
 
@@ -442,21 +693,18 @@ def _list_all_dimensions_metrics(table, dimensions, metric):
     if dimensions is not None:
         dimension_list = dimensions
 
-    for column in table.columns:
+    # columns that contain a string can not be metrics
+    for profile in table_profile:
+        column = profile['column']
         if column in dimension_list or metric == column:
             if column in dimension_list:
                 all_dimensions.append(column)
             if metric == column:
                 all_metrics.append(metric)
+        elif profile['has_strings']:
+            all_dimensions.append(column)
         else:
-            is_metric = True
-            for row_i in range(num_rows):
-                if str(type(table.loc[row_i, column])) == "<class 'str'>":
-                    is_metric = False
-            if is_metric == True:
-                all_metrics.append(column)
-            else:
-                all_dimensions.append(column)
+            all_metrics.append(column)
     return (all_dimensions, all_metrics)
 
 def _get_number_of_column_label(label):
@@ -585,14 +833,14 @@ def _get_all_row_labels(rangeA1Notation):
 
     return list_of_row_labels
 
-def _get_cheader_to_clabel(table, all_column_labels): 
+def _get_cheader_to_clabel(table_header, all_column_labels): 
     """ 
     This function returns a dictionary mapping all column headers to their respective
     column label.
 
     Args:
-        table : Type-Pandas dataframe
-            Contents of the sheets
+        table_header : Type-list of str
+            Column headers of the sheet, in the same order as in the sheet
         all_column_lables : Type-list of str
             Contains all column labels in same order as column headers
     Returns:
@@ -603,6 +851,6 @@ def _get_cheader_to_clabel(table, all_column_labels):
     cheader_to_clabel = {}
 
     for i in range(len(all_column_labels)) :
-        cheader_to_clabel[table[0][i]] = all_column_labels[i]
+        cheader_to_clabel[table_header[i]] = all_column_labels[i]
 
     return cheader_to_clabel
@@ -23,6 +23,9 @@ and the values contains a negative value , the oversight is passed.
 
 """
 
+import numpy
+import pandas
+
 from util import enums
 
 def attribution_with_hidden_negative(values):
@@ -44,12 +47,48 @@ def attribution_with_hidden_negative(values):
             negative_exists = True
 
     if negative_exists :
-        suggestion = {}
-        suggestion['suggestion'] = 'There exists negative values among the values on which proportion is being applied'
-        suggestion['oversight'] = enums.Oversights.ATTRIBUTION_WITH_HIDDEN_NEGATIVES
-        suggestion['is_row_level_suggestion'] = True
-        suggestion['confidence_score'] = 1
-        
-        return suggestion
+        return _suggestion()
     else :
-        return None
\ No newline at end of file
+        return None
+
+def attribution_with_hidden_negative_of_groups(table, dimensions, column):
+    """ This function detects the attribution_with_hidden_negative oversight
+    for every group formed by grouping the table by dimensions, when the
+    proportion of <sum/count> of column is taken for each group.
+
+    A group has a negative value if the minimum of the group is negative,
+    the minimum of all the groups is taken in one grouped aggregation.
+    Only numeric columns are checked, as only int and float values
+    are checked by attribution_with_hidden_negative.
+
+    Args:
+        table: Type-pandas.dataframe
+            It has the contents of the csv file
+        dimensions: Type-list of str
+            It contains the names of columns according to which we group
+        column: Type-str
+            name of the column on which proportion is applied
+
+    Returns:
+        List of tuples (group_position, suggestion), group_position being
+        the 0-indexed position of the group in the grouped result, in
+        increasing order of group_position
+    """
+    if not pandas.api.types.is_numeric_dtype(table[column]) or \
+       pandas.api.types.is_bool_dtype(table[column]):
+        return []
+
+    negative_exists = table.groupby(dimensions)[column].min() < 0
+
+    return [(int(group_position), _suggestion())
+            for group_position in numpy.flatnonzero(negative_exists.values)]
+
+def _suggestion():
+    """ Returns a new suggestion dictionary for the oversight """
+    suggestion = {}
+    suggestion['suggestion'] = 'There exists negative values among the values on which proportion is being applied'
+    suggestion['oversight'] = enums.Oversights.ATTRIBUTION_WITH_HIDDEN_NEGATIVES
+    suggestion['is_row_level_suggestion'] = True
+    suggestion['confidence_score'] = 1
+
+    return suggestion
\ No newline at end of file
@@ -19,9 +19,8 @@ user's might not be aware of it. It can also given the list of rows on
 which the disimilarity might have appeared.
 """
 
-import pandas
 from util import aspects, constants
-from util.enums import SummaryOperators, Filters, Oversights
+from util.enums import SummaryOperators, Oversights
 
 def benchmark_set_too_different(table, metric, all_metric, slice_compare_column, 
                                 slice1, summary_operator, **kwargs):
@@ -79,27 +78,18 @@ def benchmark_set_too_different(table, metric, all_metric, slice_compare_column,
 
     table = aspects.crop_other_columns(table, required_columns)
 
-    """ required_table_for_one is a table which has data for the 
-        single variable given by the user by which we shall do 
-        comparision"""
-    required_table_for_one = aspects.slice_table(table, [(slice_compare_column, 
-                                                 Filters.EQUAL_TO, slice1)])
-
-    """ required_table_for_all is a table which has all the data which was in
-        the initial table but with the comparision column as '*' because we
-        have to compare single value with the whole table"""
-    required_table_for_all = table.copy()
-    required_table_for_all[slice_compare_column] = '*'
-
-    updated_table = pandas.concat([required_table_for_one, required_table_for_all])
-    updated_table = updated_table.reset_index()
-    
-    grouping_columns = []
+    dimension_list = []
     if dimensions is not None:
-        grouping_columns = dimensions.copy()
+        dimension_list = dimensions.copy()
+
+    """ slice1 is compared with the whole table, so the whole table is
+        grouped with the comparision column as '*' along with slice1"""
+    result_table = aspects.group_by_slice_and_all(table, dimension_list,
+                                                  slice_compare_column, slice1,
+                                                  '*', summary_operator)['table']
+
+    grouping_columns = dimension_list.copy()
     grouping_columns.append(slice_compare_column)
-    
-    result_table = aspects.group_by(updated_table, grouping_columns, summary_operator)['table']
 
     other_metrics = all_metric.copy()
     other_metrics.remove(metric)
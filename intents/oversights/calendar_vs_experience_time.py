@@ -62,6 +62,13 @@ def calendar_vs_experience_time(table, metric, all_dimensions, slice_compare_col
         summary_operator: Type-summary_operators enum members
             It denotes the summary operator, after grouping by dimensions.
             ex. SummaryOperators.MAX, SummaryOperators.SUM
+        prefiltered: Type-Bool
+            True if the date range, the slices and the condition to keep
+            only slice1 & slice2 are already applied on the table,
+            then they are not applied again. Default False.
+        row_dates: Type-pandas.Series
+            The date column of the table already parsed, if the caller
+            has it. Optional, parsed here if not passed.
 
     Note-summary_operator is always applied on metric column passed,
          and only when grouping is done
@@ -84,49 +91,37 @@ def calendar_vs_experience_time(table, metric, all_dimensions, slice_compare_col
     if date_range is None or dimensions is not None:
         return
 
-    table = aspects.apply_date_range(table, date_range,
-                                     date_column_name, day_first)
-    
-    slice_list = []
-    if slices is not None:
-        slice_list = slices.copy()
-    slice_list.append((slice_compare_column, Filters.IN, [slice1, slice2]))
+    prefiltered = kwargs.get('prefiltered', False)
 
-    table = aspects.slice_table(table, slice_list)
+    if not prefiltered:
+        table = aspects.apply_date_range(table, date_range,
+                                         date_column_name, day_first)
 
-    # date columns for slice 1 and slice 2
-    date_column_1 = []
-    date_column_2 = []
-
-    num_rows = table.shape[0]
+        slice_list = []
+        if slices is not None:
+            slice_list = slices.copy()
+        slice_list.append((slice_compare_column, Filters.IN, [slice1, slice2]))
 
-    for row in range(num_rows):
-        if table.loc[row, slice_compare_column] == slice1:
-            date_column_1.append(table.loc[row, date_column_name])
-        if table.loc[row, slice_compare_column] == slice2:
-            date_column_2.append(table.loc[row, date_column_name])
-    
-    # converting string dates to datetime objects
-    date_column_1 = [date_module.str_to_datetime(date, day_first) for date in date_column_1]
-    date_column_2 = [date_module.str_to_datetime(date, day_first) for date in date_column_2]
+        table = aspects.slice_table(table, slice_list)
 
+    # converting string dates to datetime, all the rows are parsed together,
+    # only if the caller does not already have them
+    row_dates = kwargs.get('row_dates', None)
+    if row_dates is None:
+        row_dates = date_module.str_to_datetime_column(table[date_column_name], day_first)
 
-    date_column_1.sort()
-    date_column_2.sort()
+    # date columns for slice 1 and slice 2
+    date_column_1 = row_dates[table[slice_compare_column] == slice1]
+    date_column_2 = row_dates[table[slice_compare_column] == slice2]
 
     if len(date_column_1) == 0 or len(date_column_2) == 0:
     	return
 
-    if date_column_1[0] > date_column_2[0]:
-    	swap(date_column_1, date_column_2)
-
-    num_less = 0
-    num_total = 0
+    if date_column_1.min() > date_column_2.min():
+    	(date_column_1, date_column_2) = (date_column_2, date_column_1)
 
-    for date in date_column_1:
-    	if date < date_column_2[0]:
-    		num_less += 1
-    	num_total += 1
+    num_less = int((date_column_1 < date_column_2.min()).sum())
+    num_total = len(date_column_1)
 
     parameter = num_less / num_total
 
@@ -0,0 +1,302 @@
+"""
+Copyright 2020 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+https://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+This module computes the drill-down results used by the simpson's paradox
+and the top-down error oversights.
+Both the oversights compare the result requested by the user with the
+results after adding one more dimension in the grouping, so the grouped
+results are computed here once and can be shared by both of them.
+The groupings for the different dimensions added are independent of
+each other, so they can also be computed in parallel by a pool of
+processes.
+"""
+import concurrent.futures
+import multiprocessing
+import numpy
+import pandas
+import threading
+from util import aspects
+
+# the pools of processes are started once and shared by all the calls,
+# one pool for every number of workers asked for
+_pools = {}
+_pools_lock = threading.Lock()
+
+def drill_down_results(table, metric, all_dimensions, slice_compare_column,
+                       summary_operator, **kwargs):
+    """This function groups the table by the dimensions and the slice-compare
+    column, and then once again for every other dimension added in the
+    grouping.
+
+    Args:
+        table: Type-pandas.dataframe
+            The table after applying the date range and slices, containing
+            only the rows of the 2 slices compared.
+        metric: Type-string
+            It is the name of the column on which summary operator is applied.
+        all_dimensions: Type-list of str
+            It contains list of all dimensions
+        slice_compare_column: Type-string
+            name of the slice-compare column.
+        summary_operator: Type-summary_operators enum members
+            It denotes the summary operator, after grouping by dimensions.
+            ex. SummaryOperators.MAX, SummaryOperators.SUM
+        dimensions: Type-list of str or None
+            It is the name of column we want.
+            In query:'compare batsman A and B according to total_runs',
+             dimension is 'batsman'. we group by dimensions.
+        workers: Type-int
+            Number of processes used to compute the groupings for the
+            dimensions added, a positive integer. The pool of processes
+            is started once and reused by the later calls.
+            Default 1, computed in the calling process.
+
+    Returns:
+        A dictionary with keys -
+        'result_table' - the result table requested by the user
+        'drill_down_tables' - list of tuples (column, result table after
+            adding the column in the grouping), one for every dimension
+            that is not already in the grouping.
+    """
+    dimensions = kwargs.get('dimensions', None)
+
+    workers = kwargs.get('workers', 1)
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+        raise Exception('The number of workers must be a positive integer')
+
+    # removing all metric column except the one by which we do group_by operation
+    required_columns = all_dimensions.copy()
+    required_columns.append(metric)
+    table = aspects.crop_other_columns(table, required_columns)
+
+    # operational_dimensions contain list of all dimension except
+    # slice_compare_column
+    operational_dimensions = all_dimensions.copy()
+    operational_dimensions.remove(slice_compare_column)
+
+    required_columns = []
+    if dimensions is not None:
+        required_columns = dimensions.copy()
+    required_columns.append(slice_compare_column)
+    required_columns.append(metric)
+
+    query_table = aspects.crop_other_columns(table, required_columns)
+
+    grouping_columns = []
+    if dimensions is not None:
+        grouping_columns = dimensions.copy()
+    grouping_columns.append(slice_compare_column)
+
+    result_table = aspects.group_by(query_table, grouping_columns,
+                                    summary_operator)['table']
+
+    dimension_list = []
+    if dimensions is not None:
+        dimension_list = dimensions.copy()
+
+    # every column which is not in the grouping list initially
+    # is added in the grouping
+    new_columns = []
+    for column in operational_dimensions:
+        if column not in dimension_list:
+            new_columns.append(column)
+
+    # there is one task for every column added
+    workers = min(workers, len(new_columns))
+
+    if workers > 1:
+        new_result_tables = _drill_down_tables_in_pool(table, metric, dimension_list,
+                                                       new_columns, slice_compare_column,
+                                                       summary_operator, workers)
+    else:
+        new_result_tables = []
+        for column in new_columns:
+            new_result_tables.append(_drill_down_table(table, metric, dimension_list,
+                                                       column, slice_compare_column,
+                                                       summary_operator))
+
+    drill_down_tables = list(zip(new_columns, new_result_tables))
+
+    return {'result_table': result_table, 'drill_down_tables': drill_down_tables}
+
+def keep_slices(drill_down_results, slice_compare_column, slice_values):
+    """This function keeps only the rows of the given slices in the tables
+    of the drill-down results, as if the drill-down results were computed
+    on the rows of those slices only.
+    Every group has a single slice, so the groups of the other slices are
+    simply dropped, the index of the rows is kept so that the rows can be
+    traced back to the tables with all the slices.
+
+    Args:
+        drill_down_results: Type-dictionary
+            As returned by drill_down_results
+        slice_compare_column: Type-string
+            name of the slice-compare column.
+        slice_values: Type-list
+            values of the slice-compare column that are kept
+
+    Returns:
+        A dictionary with the same keys as drill_down_results
+    """
+    result_table = drill_down_results['result_table']
+    result_table = result_table[result_table[slice_compare_column].isin(slice_values)]
+
+    drill_down_tables = []
+    for (column, new_result_table) in drill_down_results['drill_down_tables']:
+        new_result_table = new_result_table[new_result_table[slice_compare_column].isin(slice_values)]
+        drill_down_tables.append((column, new_result_table))
+
+    return {'result_table': result_table, 'drill_down_tables': drill_down_tables}
+
+def unstack_slices(result_table, group_columns, slice_compare_column, slice1):
+    """This function unstacks a result table grouped by the group_columns and
+    the slice-compare column, so that there is one row for every group
+    with the values of both the slices in it.
+
+    The groups are kept in the order they appear in the result table, and
+    the index has an extra first level with a single value, so that the
+    table can be grouped by a prefix of the group_columns even if that
+    prefix is empty.
+
+    Args:
+        result_table: Type-pandas.dataframe
+            Table returned by group_by, the columns are the group_columns,
+            the slice-compare column & the metric, in this order.
+        group_columns: Type-list of str
+            The columns by which the table is grouped, other than the
+            slice-compare column.
+        slice_compare_column: Type-string
+            name of the slice-compare column.
+        slice1: Type-string
+            the first value of comparision, every other value of the
+            slice-compare column is taken as the second slice.
+
+    Returns:
+        pandas.dataframe with one row for every group & columns -
+        'position' - position of the first row of the group in result_table
+        'num_slices' - number of slices present for the group
+        'slice1_value' - metric for slice1, 0 if slice1 is not present
+        'slice2_value' - metric for the second slice, 0 if it is not present
+    """
+    metric = result_table.columns[-1]
+
+    keys = [pandas.Series(0, index=result_table.index)]
+    for column in group_columns:
+        keys.append(result_table[column])
+
+    positions = pandas.Series(numpy.arange(result_table.shape[0]),
+                              index=result_table.index)
+
+    unstacked = positions.groupby(keys, sort=False).agg(['first', 'size'])
+    unstacked.columns = ['position', 'num_slices']
+
+    # groups without a slice get 0 as its metric, like the rest of the
+    # values of that slice it is subtracted from the other slice
+    values = result_table.set_index(keys + [result_table[slice_compare_column]])[metric]
+    values = values.unstack(level=-1, fill_value=0)
+    values = values.reindex(unstacked.index)
+
+    is_slice1 = values.columns == slice1
+
+    unstacked['slice1_value'] = values.loc[:, is_slice1].sum(axis=1, skipna=False)
+    unstacked['slice2_value'] = values.loc[:, ~is_slice1].sum(axis=1, skipna=False)
+
+    return unstacked
+
+def _drill_down_table(table, metric, dimension_list, column,
+                      slice_compare_column, summary_operator):
+    """This function returns the result table after adding the column
+    in the grouping list, between the dimensions & the slice-compare column.
+
+    Args:
+        table: Type-pandas.dataframe
+        metric: Type-string
+        dimension_list: Type-list of str
+            The dimensions passed by the user, empty if none.
+        column: Type-string
+            The dimension added in the grouping.
+        slice_compare_column: Type-string
+        summary_operator: Type-summary_operators enum members
+
+    Returns:
+        The grouped table, Type-pandas.dataframe
+    """
+    new_grouping_columns = dimension_list.copy()
+    new_grouping_columns.append(column)
+    new_grouping_columns.append(slice_compare_column)
+
+    new_required_columns = new_grouping_columns.copy()
+    new_required_columns.append(metric)
+    new_cropped_table = aspects.crop_other_columns(table, new_required_columns)
+
+    return aspects.group_by(new_cropped_table, new_grouping_columns,
+                            summary_operator)['table']
+
+def _drill_down_tables_in_pool(table, metric, dimension_list, new_columns,
+                               slice_compare_column, summary_operator, workers):
+    """This function computes the result tables for every column added in
+    the grouping, in a pool of processes.
+    Every task is sent only the columns it groups, not the whole table.
+    The results are returned in the order of new_columns, irrespective of
+    the order in which the processes finish.
+
+    Args:
+        table: Type-pandas.dataframe
+        metric: Type-string
+        dimension_list: Type-list of str
+        new_columns: Type-list of str
+            The dimensions to be added in grouping, one at a time.
+        slice_compare_column: Type-string
+        summary_operator: Type-summary_operators enum members
+        workers: Type-int
+            Number of processes in the pool.
+
+    Returns:
+        List of the grouped tables, in the order of new_columns
+    """
+    executor = _get_pool(workers)
+
+    futures = []
+    for column in new_columns:
+        required_columns = dimension_list.copy()
+        required_columns.append(column)
+        required_columns.append(slice_compare_column)
+        required_columns.append(metric)
+        column_table = aspects.crop_other_columns(table, required_columns)
+
+        futures.append(executor.submit(_drill_down_table, column_table,
+                                       metric, dimension_list, column,
+                                       slice_compare_column, summary_operator))
+
+    return [future.result() for future in futures]
+
+def _get_pool(workers):
+    """This function returns the pool of the given number of processes,
+    it is started on the first call and reused by the later calls.
+    The processes are not forked from the calling process, which may be
+    running other threads(ex. a threaded server) - a fork copies the locks
+    held by those threads and can deadlock. They are started by a fork
+    server(a fresh single-threaded process) where available, else spawned.
+    """
+    with _pools_lock:
+        if workers not in _pools:
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('forkserver')
+            else:
+                context = multiprocessing.get_context('spawn')
+            _pools[workers] = concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                                     mp_context=context)
+        return _pools[workers]
@@ -30,6 +30,9 @@ sys.path.append(".")
 # for calculation standard deviation i.e pstdev() and mean i.e mean()
 import statistics 
 
+import numpy
+import pandas
+
 from util import constants, enums
  
 def mean_vs_median(values):
@@ -104,3 +107,101 @@ def _skew(values):
 
 	return skew_value
 
+def mean_vs_median_of_groups(table, dimensions, column):
+    """ This function detects the mean_vs_median oversight for every group
+    formed by grouping the table by dimensions, when the mean of column
+    is taken for each group.
+    The skew of all the groups is computed at once from grouped moments,
+    and the suggestions are built from it. The skew from moments can differ
+    from _skew in the last digits, so only the groups whose skew is within
+    a small margin of the cut-off are checked with mean_vs_median itself.
+    The missing values(NaN) of a group are not counted in its skew.
+
+    Args:
+        table: Type-pandas.dataframe
+            It has the contents of the csv file
+        dimensions: Type-list of str
+            It contains the names of columns according to which we group
+        column: Type-str
+            name of the numeric column whose mean is taken
+
+    Returns:
+        List of tuples (group_position, suggestion), group_position being
+        the 0-indexed position of the group in the grouped result, in
+        increasing order of group_position
+    """
+    skew_values = _skew_of_groups(table, dimensions, column)
+
+    lower_bound = constants.LOWER_BOUND_SIMILARITY_MEAN_VS_MEDIAN
+    upper_bound = constants.UPPER_BOUND_SIMILARITY_MEAN_VS_MEDIAN
+    margin = 1e-6
+
+    is_skewed = ((skew_values < lower_bound - margin) |
+                 (skew_values > upper_bound + margin)).values
+    is_near_cut_off = ((abs(skew_values - lower_bound) <= margin) |
+                       (abs(skew_values - upper_bound) <= margin)).values
+
+    group_indices = None
+    if is_near_cut_off.any():
+        group_indices = table.groupby(dimensions)[column].indices
+
+    suggestions = []
+    for group_position in numpy.flatnonzero(is_skewed | is_near_cut_off):
+        if is_skewed[group_position]:
+            suggestion = {}
+            suggestion['suggestion'] = 'Median is very different from the Mean'
+            suggestion['oversight'] = enums.Oversights.MEAN_VS_MEDIAN
+            suggestion['is_row_level_suggestion'] = True
+            suggestion['confidence_score'] = float(skew_values.iat[group_position])
+        else:
+            group_key = skew_values.index[group_position]
+            values = table[column].take(group_indices[group_key]).dropna()
+            suggestion = mean_vs_median(values.tolist())
+
+        if suggestion is not None:
+            suggestions.append((int(group_position), suggestion))
+
+    return suggestions
+
+def _skew_of_groups(table, dimensions, column):
+    """ This function calculates the same skew value as _skew, for
+    every group formed by grouping the table by dimensions.
+    It uses the count and the sums of squares and cubes of deviations
+    from the group mean, all computed by native grouped aggregations.
+    (1/((n-1)*(n-2)))*(sum over i { ((values[i]-mean(values))/(std_dev))**3) }
+    = (n/((n-1)*(n-2))) * sum_of_cubes / (std_dev**3)
+    std_dev = (sum_of_squares / n)**0.5
+
+    Args:
+        table: Type-pandas.dataframe
+        dimensions: Type-list of str
+        column: Type-str
+
+    Returns:
+        pandas.Series of skew values indexed by the groups
+    """
+    grouped_values = table.groupby(dimensions)[column]
+
+    deviations = table[column] - grouped_values.transform('mean')
+
+    moments = pandas.DataFrame({'count' : table[column].notna(),
+                                'sum_of_squares' : deviations ** 2,
+                                'sum_of_cubes' : deviations ** 3,
+                                'min' : table[column],
+                                'max' : table[column]})
+    moments = moments.groupby([table[dimension] for dimension in dimensions]).agg(
+        {'count' : 'sum', 'sum_of_squares' : 'sum', 'sum_of_cubes' : 'sum',
+         'min' : 'min', 'max' : 'max'})
+
+    size = moments['count']
+    variance = moments['sum_of_squares'] / size
+
+    # If there are <=2 entries or there is no deviation
+    # we assume to not have any skewness, the deviation of equal values
+    # from their mean is checked exactly, not with the rounded variance
+    has_skew = (size > 2) & (moments['max'] > moments['min'])
+
+    skew_values = (moments['sum_of_cubes'] / variance[has_skew] ** 1.5) * \
+                  size / ((size - 1) * (size - 2))
+
+    return skew_values.where(has_skew, 0)
@@ -67,6 +67,10 @@ def regression_to_mean(table, metric, dimensions, is_asc, k, **kwargs):
             It is required by datetime.strp_time to parse the date in the format
             Format Codes
 https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
+        day_first: Type-bool
+            Day_first denotes that does day in the date occurs before month in the
+            dates in the date column, the same for both the time windows
+            Example - '29-02-19', here day_first is true
         slices: Type-List of tuples
             Tuple represents the conditon to keep the row.
             (column_name, filter, value)
@@ -76,6 +80,9 @@ https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
         summary_operator: Type-summary_operators enum members
             It denotes the summary operator, after grouping by dimensions.
             ex. SummaryOperators.MAX, SummaryOperators.SUM
+        current_topk: Type-pandas dataframe
+            The top-k results in the given date range, if the caller has
+            already computed them. Optional, computed if not passed.
 
     Returns:
         suggestion : dictonary with keys 'suggestion', 'oversight_name'
@@ -83,19 +90,23 @@ https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
     date_column_name = kwargs.get('date_column_name', 'date')
     date_range = kwargs.get('date_range', None)
     date_format = kwargs.get('date_format', '%Y-%m-%d')
+    day_first = kwargs.get('day_first', False)
     slices = kwargs.get('slices', None)
     summary_operator = kwargs.get('summary_operator', None)
 
-    # top-k in the given time window
-    current_topk = topk.topk_results(table, metric, dimensions, is_asc, k,
-                                     date_column_name=date_column_name,
-                                     date_range=date_range,
-                                     date_format=date_format, slices=slices,
-                                     summary_operator=summary_operator)[0]
-
     if date_range is None:
         return
 
+    # top-k in the given time window, computed here only if the
+    # caller does not already have it
+    current_topk = kwargs.get('current_topk', None)
+    if current_topk is None:
+        current_topk = topk.topk_results(table, metric, dimensions, is_asc, k,
+                                         date_column_name=date_column_name,
+                                         date_range=date_range,
+                                         day_first=day_first, slices=slices,
+                                         summary_operator=summary_operator)[0]
+
     current_topk_set = _convert_to_set(current_topk, dimensions)
 
     # results of the other time interval may contain duplicates,
@@ -116,7 +127,7 @@ https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
                                       slices=slices,
                                       summary_operator=summary_operator,
                                       date_column_name=date_column_name,
-                                      date_format=date_format,
+                                      day_first=day_first,
                                       date_range=(previous_start, previous_end))[0]
 
     set_intersect_suggestions = _set_intersect(previous_topk,
@@ -22,6 +22,7 @@ suggest the user to do operation on those groups.
 """
 import pandas
 from util import aspects
+from oversights import drill_down
 from util.enums import SummaryOperators, Filters, Oversights
 from util import constants 
 
@@ -65,6 +66,17 @@ https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
         summary_operator: Type-summary_operators enum members
             It denotes the summary operator, after grouping by dimensions.
             ex. SummaryOperators.MAX, SummaryOperators.SUM
+        prefiltered: Type-Bool
+            True if the date range, the slices and the condition to keep
+            only slice1 & slice2 are already applied on the table,
+            then they are not applied again. Default False.
+        drill_down_results: Type-dictionary
+            The results grouped by the dimensions and by each of the other
+            dimensions added, as returned by drill_down.drill_down_results.
+            Optional, computed from the table if not passed.
+        workers: Type-int
+            Number of processes used to compute the drill_down_results,
+            if they are not passed. Default 1.
 
     Note-summary_operator is always applied on metric column passed,
          and only when grouping is done
@@ -82,78 +94,55 @@ https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
 
     dimensions = kwargs.get('dimensions', None)
 
-    table = aspects.apply_date_range(table, date_range,
-                                     date_column_name, day_first)
+    prefiltered = kwargs.get('prefiltered', False)
 
-    slice_list = []
-    if slices is not None:
-        slice_list = slices.copy()
-    slice_list.append((slice_compare_column, Filters.IN, [slice1, slice2]))
+    # without a summary operator the rows are not grouped, so there
+    # are no results of the groups to be compared
+    if summary_operator is None:
+        return []
 
-    table = aspects.slice_table(table, slice_list)
+    # results grouped by the dimensions, and then by adding each of the
+    # other dimensions in grouping, computed here only if not passed
+    drill_down_results = kwargs.get('drill_down_results', None)
 
-    # removing all metric column except the one by which we do group_by operation
-    required_columns = all_dimensions.copy()
-    required_columns.append(metric)
-    table = aspects.crop_other_columns(table, required_columns)
+    if drill_down_results is None:
+        if not prefiltered:
+            table = aspects.apply_date_range(table, date_range,
+                                             date_column_name, day_first)
 
-    # operational_dimensions contain list of all dimension except 
-    # slice_compare_column
-    operational_dimensions = all_dimensions.copy()
-    operational_dimensions.remove(slice_compare_column)
-    
-    required_columns = []
-    if dimensions is not None:
-        required_columns = dimensions.copy()
-    required_columns.append(slice_compare_column)
-    required_columns.append(metric)
+            slice_list = []
+            if slices is not None:
+                slice_list = slices.copy()
+            slice_list.append((slice_compare_column, Filters.IN, [slice1, slice2]))
 
-    query_table = aspects.crop_other_columns(table, required_columns)
+            table = aspects.slice_table(table, slice_list)
 
-    grouping_columns = []
-    if dimensions is not None:
-        grouping_columns = dimensions.copy()
-    grouping_columns.append(slice_compare_column)
+        drill_down_results = drill_down.drill_down_results(table, metric,
+                                                           all_dimensions,
+                                                           slice_compare_column,
+                                                           summary_operator,
+                                                           dimensions = dimensions,
+                                                           workers = kwargs.get('workers', 1))
 
     # initial_result_table is the result table requested by user.
-    initial_result_table = aspects.group_by(query_table,
-                                            grouping_columns,
-                                            summary_operator)['table']
+    initial_result_table = drill_down_results['result_table']
+
     # suggestions store the list of debiasing for this oversight.
     suggestions = []
 
-    dimension_list = []
+    dimensions_len = 0
     if dimensions is not None:
-        dimension_list = dimensions.copy()
-
-    dimensions_len = len(dimension_list)
-
-    for column in operational_dimensions:
-        # we try to find the debiasing for every column which 
-        # is not in the grouping list initially
-        if column not in dimension_list:
-            new_grouping_columns = dimension_list.copy()
-            new_grouping_columns.append(column)
-            new_grouping_columns.append(slice_compare_column)
-
-            new_required_columns = new_grouping_columns.copy()
-            new_required_columns.append(metric)
-            new_cropped_table = aspects.crop_other_columns(table, 
-                                                           new_required_columns)
-
-            # result table after adding the new column in the grouping list.
-            new_result_table = aspects.group_by(new_cropped_table,
-                                                new_grouping_columns,
-                                                summary_operator)['table']
-            
-            # it will return the debiasing suggestion after comparing the
-            # initial result table and new result table.
-            new_suggestion =  _check_simpsons_paradox(initial_result_table,
-                                                      new_result_table, 
-                                                      column, slice1,
-                                                      dimensions_len)
-            if new_suggestion != None:
-                suggestions.append(new_suggestion)
+        dimensions_len = len(dimensions)
+
+    for (column, new_result_table) in drill_down_results['drill_down_tables']:
+        # it will return the debiasing suggestion after comparing the
+        # initial result table and new result table.
+        new_suggestion = _check_simpsons_paradox(initial_result_table,
+                                                 new_result_table,
+                                                 column, slice1,
+                                                 dimensions_len)
+        if new_suggestion != None:
+            suggestions.append(new_suggestion)
     return suggestions
 
 def _check_simpsons_paradox(initial_result_table, new_result_table, new_added_column,
@@ -175,72 +164,44 @@ def _check_simpsons_paradox(initial_result_table, new_result_table, new_added_co
         return a dictionary where each dictionary represent a debiasing 
                suggestion according to the new column.
     """
-    initial_num_rows = initial_result_table.shape[0]
-    new_num_rows = new_result_table.shape[0]
+    if initial_result_table.shape[0] == 0 or new_result_table.shape[0] == 0:
+        return None
 
-    # changing dataframe to list of list to do next set of operation
-    initial_table_matrix = initial_result_table.values.tolist()
-    new_table_matrix = new_result_table.values.tolist()
+    # the columns are the dimensions, (the new added column),
+    # the slice-compare column & the metric
+    dimensions = list(initial_result_table.columns[:dimensions_len])
+    slice_compare_column = initial_result_table.columns[dimensions_len]
 
-    initial_row_i = 0
-    new_row_i = 0
+    # one row for every group, with the values of both the slices
+    initial_slices = drill_down.unstack_slices(initial_result_table, dimensions,
+                                               slice_compare_column, slice1)
+    new_slices = drill_down.unstack_slices(new_result_table,
+                                           dimensions + [new_added_column],
+                                           slice_compare_column, slice1)
 
-    suggestion_row_list = []
+    # level 0 is the single value level added by unstack_slices,
+    # so that grouping by no dimensions is also possible
+    dimension_levels = list(range(dimensions_len + 1))
 
     # dominant percentage is the percentage of pairs where 
     # (first value - second value) is positive.
+    new_difference = new_slices['slice1_value'] - new_slices['slice2_value']
+    new_is_positive = (new_difference > 0).groupby(level=dimension_levels, sort=False)
+    new_dominant_percent = (new_is_positive.sum() / new_is_positive.size()) * 100
+    new_dominant_percent = new_dominant_percent.reindex(initial_slices.index)
+
+    initial_difference = initial_slices['slice1_value'] - initial_slices['slice2_value']
+    initial_dominant_percent = (initial_difference > 0) * 100
 
-    while initial_row_i < initial_num_rows:
-        positive_count = 0
-        total_count = 0
-
-        while new_row_i < new_num_rows and initial_table_matrix[initial_row_i][:dimensions_len] == new_table_matrix[new_row_i][:dimensions_len] :
-            new_difference = 0
-
-            if new_row_i == new_num_rows - 1 or new_table_matrix[new_row_i][:dimensions_len + 1] != new_table_matrix[new_row_i + 1][:dimensions_len + 1]:
-                if new_table_matrix[new_row_i][dimensions_len + 1] == slice1:
-                    new_difference = new_table_matrix[new_row_i][dimensions_len + 2]
-                else:
-                    new_difference = -new_table_matrix[new_row_i][dimensions_len + 2]
-            else:
-                if new_table_matrix[new_row_i][dimensions_len + 1] == slice1:
-                    new_difference = new_table_matrix[new_row_i][dimensions_len + 2] - new_table_matrix[new_row_i + 1][dimensions_len + 2]
-                else:
-                    new_difference = new_table_matrix[new_row_i + 1][dimensions_len + 2] - new_table_matrix[new_row_i][dimensions_len + 2]
-                new_row_i = new_row_i + 1
-
-            if new_difference > 0:
-                positive_count = positive_count + 1
-            total_count = total_count + 1
-
-            new_row_i = new_row_i + 1
-        # it stores the dominant percent for the new table
-        new_dominant_percent = (positive_count / total_count) * 100
-
-        initial_difference = 0
-
-        # True if it is the last row or there is only one slice for this group.
-        if initial_row_i == initial_num_rows - 1 or initial_table_matrix[initial_row_i][:dimensions_len] != initial_table_matrix[initial_row_i + 1][:dimensions_len]:
-            initial_row_i = initial_row_i + 1
-            continue
-        else:
-            if initial_table_matrix[initial_row_i][dimensions_len] == slice1:
-                initial_difference = initial_table_matrix[initial_row_i][dimensions_len + 1] - initial_table_matrix[initial_row_i + 1][dimensions_len + 1]
-            else:
-                initial_difference = initial_table_matrix[initial_row_i + 1][dimensions_len + 1] - initial_table_matrix[initial_row_i][dimensions_len + 1]
-            initial_row_i = initial_row_i + 1
-
-        # it stores the dominant percent for the initial table
-        initial_dominant_percent = 0
-        if initial_difference > 0:
-            initial_dominant_percent = 100
-
-        if abs(initial_dominant_percent - new_dominant_percent) >= constants.SIMPSONS_PARADOX_DOMINANT_PERCENT_THRESHOLD:
-            if initial_row_i > 0 and initial_table_matrix[initial_row_i][:dimensions_len] == initial_table_matrix[initial_row_i - 1][:dimensions_len]:
-                suggestion_row_list.append({'row':initial_row_i, 'confidence_score':100})
-            suggestion_row_list.append({'row':initial_row_i + 1, 'confidence_score':100})
-
-        initial_row_i = initial_row_i + 1
+    # only the groups in which both the slices are present are compared
+    is_paradox = (initial_slices['num_slices'] == 2) & \
+                 ((initial_dominant_percent - new_dominant_percent).abs() >= \
+                  constants.SIMPSONS_PARADOX_DOMINANT_PERCENT_THRESHOLD)
+
+    suggestion_row_list = []
+    for position in initial_slices['position'][is_paradox]:
+        suggestion_row_list.append({'row':int(position) + 1, 'confidence_score':100})
+        suggestion_row_list.append({'row':int(position) + 2, 'confidence_score':100})
 
     if len(suggestion_row_list) == 0:
         return None
@@ -17,7 +17,9 @@ This module contains the tests for attribution_with_hidden_negative.py
 import sys
 sys.path.append(".")
 
-from attribution_with_hidden_negative import attribution_with_hidden_negative
+from attribution_with_hidden_negative import attribution_with_hidden_negative, \
+                                             attribution_with_hidden_negative_of_groups
+import pandas
 
 def test_1():
 	"""
@@ -47,10 +49,31 @@ def test_2():
 
 	assert(str(suggestion) == expected_suggestion)
 
+def test_3():
+	"""
+	Situation : Proportion is taken for 2 groups, the first group has the
+	numbers of test_1 (all positive) and the second the numbers of test_2
+	(some negative)
+	"""
+	rows = []
+	for group, test_name in [('A', 'test_1'), ('B', 'test_2')]:
+		test_file = open("data/data_for_test_attribution_with_hidden_negative/" + test_name + ".txt", "r")
+		for value in test_file.read().split("\n"):
+			rows.append((group, int(value)))
+	table = pandas.DataFrame(rows, columns=['group', 'value'])
+
+	suggestions = attribution_with_hidden_negative_of_groups(table, ['group'], 'value')
+	print(suggestions)
+	expected_suggestions = """[(1, {'suggestion': 'There exists negative values among the values on which proportion is being applied', 'oversight': <Oversights.ATTRIBUTION_WITH_HIDDEN_NEGATIVES: 11>, 'is_row_level_suggestion': True, 'confidence_score': 1})]"""
+
+	assert(str(suggestions) == expected_suggestions)
+
 
 print(test_1.__doc__)
 test_1()
 print(test_2.__doc__)
 test_2()
+print(test_3.__doc__)
+test_3()
 
 print('Test cases completed')
\ No newline at end of file
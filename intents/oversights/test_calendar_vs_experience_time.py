@@ -72,10 +72,37 @@ def test_2():
     expected_suggestion = 'None'
     assert(str(suggestion) == expected_suggestion)
 
+def test_3():
+    """
+        query :  compare average sales of B and A in date range 2000 to 2010
+        same as test_1 with the slices swapped, the slice with the later
+        entries is passed first. The table is already filtered, so the
+        date range & slices are not applied again.
+    """
+    table = pandas.DataFrame()
+    table['Company'] = pandas.Series(['A', 'B', 'A', 'B', 'A', 'B', 'A', 'B'])
+    table['year'] = pandas.Series(['2001', '2006', '2002', '2007', '2003', '2008', '2004', '2009'])
+    table['sales'] = pandas.Series([1, 34, 23, 42, 23, 1324, 34, 134])
+    print(table)
+    suggestion = calendar_vs_experience_time.calendar_vs_experience_time(table, 'sales',
+                                                   ['Company', 'year', 'sales'],
+                                                   'Company', 'B', 'A',
+                                                   SummaryOperators.MEAN,
+                                                   date_column_name='year',
+                                                   date_range=['2000-01-01', '2010-01-01'],
+                                                   prefiltered=True)
+    print(suggestion)
+
+    expected_suggestion = "{'oversight': <Oversights.CALENDAR_VS_EXPERIENCE_IN_TIME_SERIES: 12>, 'confidence_score': 1.0, 'suggestion': 'The entries in the date range mentioned are not consistent for both the slices'}"
+    assert(str(suggestion) == expected_suggestion)
+
 print(test_1.__doc__)
 test_1()
 
 print(test_2.__doc__)
 test_2()
 
+print(test_3.__doc__)
+test_3()
+
 print("Test cases completed")
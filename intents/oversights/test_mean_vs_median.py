@@ -11,7 +11,8 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from mean_vs_median import mean_vs_median
+from mean_vs_median import mean_vs_median, mean_vs_median_of_groups
+import pandas
 import statistics
 
 def test_1():
@@ -175,6 +176,44 @@ def test_10():
 
 	assert(str(suggestion) == expected_suggestion)		
 
+def test_11():
+	"""
+	Situation : Mean is taken for 3 groups, the first group has the values of
+	test_1 (an entry with an extra 0), the second the values of test_2 and the
+	third the values of test_10 (all 0). Only the first group has the oversight.
+	"""
+	groups = [('A', 'test_1'), ('B', 'test_2'), ('C', 'test_10')]
+	rows = []
+	for group, test_name in groups:
+		test_file = open("data/data_for_test_mean_vs_median/" + test_name + ".txt", "r")
+		for value in test_file.read().split("\n"):
+			rows.append((group, int(value)))
+	table = pandas.DataFrame(rows, columns=['group', 'value'])
+
+	suggestions = mean_vs_median_of_groups(table, ['group'], 'value')
+	print(suggestions)
+	expected_suggestions = """[(0, {'suggestion': 'Median is very different from the Mean', 'oversight': <Oversights.MEAN_VS_MEDIAN: 7>, 'is_row_level_suggestion': True, 'confidence_score': 5.315150951994629})]"""
+
+	assert(str(suggestions) == expected_suggestions)
+
+def test_12():
+	"""
+	Situation : Mean is taken for 2 groups, the first group has equal values
+	which are not exactly equal to their mean in floating point, the second
+	group has the values of test_1 and a missing value. Only the second group
+	has the oversight, the missing value is not counted in its skew.
+	"""
+	test_file = open("data/data_for_test_mean_vs_median/test_1.txt", "r")
+	values = list(map(int, test_file.read().split("\n")))
+	table = pandas.DataFrame({'group': ['A'] * 3 + ['B'] * (len(values) + 1),
+	                          'value': [0.1] * 3 + values + [float('nan')]})
+
+	suggestions = mean_vs_median_of_groups(table, ['group'], 'value')
+	print(suggestions)
+	expected_suggestions = """[(1, {'suggestion': 'Median is very different from the Mean', 'oversight': <Oversights.MEAN_VS_MEDIAN: 7>, 'is_row_level_suggestion': True, 'confidence_score': 5.315150951994629})]"""
+
+	assert(str(suggestions) == expected_suggestions)
+
 print(test_1.__doc__)
 test_1()
 
@@ -203,4 +242,10 @@ print(test_9.__doc__)
 test_9()
 
 print(test_10.__doc__)
-test_10()
\ No newline at end of file
+test_10()
+
+print(test_11.__doc__)
+test_11()
+
+print(test_12.__doc__)
+test_12()
@@ -0,0 +1,47 @@
+"""
+Copyright 2020 Google LLC
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+https://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import sys
+sys.path.append(".")
+
+import pandas
+
+from regression_to_mean import regression_to_mean
+from util.enums import SummaryOperators
+
+def test_1():
+    """
+        question :  top-3 players by total runs in February 2019,
+        the dates in the table have the day first.
+        The previous window(2019-01-04 to 2019-02-01) must also be parsed
+        with the day first, it has only 1 of the 3 players of February.
+     """
+    table = pandas.DataFrame({'player': ['A', 'B', 'C', 'A', 'D', 'E'],
+                              'runs': [30, 20, 10, 30, 20, 10],
+                              'date': ['05-02-2019', '06-02-2019', '07-02-2019',
+                                       '05-01-2019', '06-01-2019', '07-01-2019']})
+    suggestion = regression_to_mean(table, 'runs', ['player'], False, 3,
+                                    summary_operator=SummaryOperators.SUM,
+                                    date_column_name='date',
+                                    date_range=('2019-02-01', '2019-02-28'),
+                                    day_first=True)
+    print(suggestion)
+
+    expected_suggestion = "{'oversight': <Oversights.REGRESSION_TO_THE_MEAN: 4>, 'suggestion': \"very few of the top-k in the given date range will be in the previous window's top-k\"}"
+
+    assert(expected_suggestion == str(suggestion))
+
+print(test_1.__doc__)
+test_1()
+
+print('Test cases completed')
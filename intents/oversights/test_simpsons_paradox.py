@@ -81,16 +81,43 @@ def test_4():
     expected_result = "[{'suggestion': 'the relation between slices might changed a lot if you will consider subject in grouping.', 'oversight': <Oversights.SIMPSONS_PARADOX: 8>, 'is_row_level_suggestion': True, 'row_list': [{'row': 1, 'confidence_score': 100}, {'row': 2, 'confidence_score': 100}]}]"
     assert(str(query_result) == expected_result)
 
-print("\ncompare total salary of 'A' and 'B' for year 2019.")
-test_1()
+def test_5():
+    """
+        question :  compare total salary of 'A' and 'B'.
+        The groupings by month & year are computed by a pool of 2
+        processes, the suggestions are the same & in the same order
+        as computed by a single process.
+     """
+    table = pandas.read_csv('data/salary_list_modified.csv')
+    query_result = simpsons_paradox.simpsons_paradox(table, 'salary',
+                                                   ['Person name', 'month', 'year'],
+                                                   'Person name', 'A', 'B',
+                                                   SummaryOperators.SUM,
+                                                   workers = 2)
+    print(query_result)
+
+    expected_result = simpsons_paradox.simpsons_paradox(table, 'salary',
+                                                      ['Person name', 'month', 'year'],
+                                                      'Person name', 'A', 'B',
+                                                      SummaryOperators.SUM)
+    assert(str(query_result) == str(expected_result))
+
+# the processes of the pool used in test_5 import this module as well,
+# the tests are run only when it is run as a script
+if __name__ == '__main__':
+    print("\ncompare total salary of 'A' and 'B' for year 2019.")
+    test_1()
+
+    print("\ncompare avg run for 'MI' and 'CSK' by city.")
+    test_2()
 
-print("\ncompare avg run for 'MI' and 'CSK' by city.")
-test_2()
+    print("\ncompare average score of A and B by class.")
+    test_3()
 
-print("\ncompare average score of A and B by class.")
-test_3()
+    print("\ncompare average score of A and B by class again.")
+    test_4()
 
-print("\ncompare average score of A and B by class again.")
-test_4()
+    print("\ncompare total salary of 'A' and 'B' using 2 processes.")
+    test_5()
 
-print("\nTest cases completed")
+    print("\nTest cases completed")
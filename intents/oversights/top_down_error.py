@@ -22,6 +22,7 @@ suggest the user to do operation on those groups.
 """
 import pandas
 from util import aspects
+from oversights import drill_down
 from util.enums import SummaryOperators, Filters, Oversights
 from util import constants 
 
@@ -66,6 +67,17 @@ https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
         summary_operator: Type-summary_operators enum members
             It denotes the summary operator, after grouping by dimensions.
             ex. SummaryOperators.MAX, SummaryOperators.SUM
+        prefiltered: Type-Bool
+            True if the date range, the slices and the condition to keep
+            only slice1 & slice2 are already applied on the table,
+            then they are not applied again. Default False.
+        drill_down_results: Type-dictionary
+            The results grouped by the dimensions and by each of the other
+            dimensions added, as returned by drill_down.drill_down_results.
+            Optional, computed from the table if not passed.
+        workers: Type-int
+            Number of processes used to compute the drill_down_results,
+            if they are not passed. Default 1.
 
     Note-summary_operator is always applied on metric column passed,
          and only when grouping is done
@@ -83,79 +95,55 @@ https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
 
     dimensions = kwargs.get('dimensions', None)
 
-    table = aspects.apply_date_range(table, date_range,
-                                     date_column_name, day_first)
-    
-    slice_list = []
-    if slices is not None:
-        slice_list = slices.copy()
-    slice_list.append((slice_compare_column, Filters.IN, [slice1, slice2]))
-
-    table = aspects.slice_table(table, slice_list)
-
-    # removing all metric column except the one by which we do 
-    # group_by operation
-    required_columns = all_dimensions.copy()
-    required_columns.append(metric)
-    table = aspects.crop_other_columns(table, required_columns)
-
-    # operational_dimensions contain list of all dimension except 
-    # slice_compare_column
-    operational_dimensions = all_dimensions.copy()
-    operational_dimensions.remove(slice_compare_column)
-    
-    required_columns = []
-    if dimensions is not None:
-        required_columns = dimensions.copy()
-    required_columns.append(slice_compare_column)
-    required_columns.append(metric)
+    prefiltered = kwargs.get('prefiltered', False)
 
-    query_table = aspects.crop_other_columns(table, required_columns)
+    # without a summary operator the rows are not grouped, so there
+    # are no results of the groups to be compared
+    if summary_operator is None:
+        return []
 
-    grouping_columns = []
-    if dimensions is not None:
-        grouping_columns = dimensions.copy()
-    grouping_columns.append(slice_compare_column)
+    # results grouped by the dimensions, and then by adding each of the
+    # other dimensions in grouping, computed here only if not passed
+    drill_down_results = kwargs.get('drill_down_results', None)
+
+    if drill_down_results is None:
+        if not prefiltered:
+            table = aspects.apply_date_range(table, date_range,
+                                             date_column_name, day_first)
+
+            slice_list = []
+            if slices is not None:
+                slice_list = slices.copy()
+            slice_list.append((slice_compare_column, Filters.IN, [slice1, slice2]))
+
+            table = aspects.slice_table(table, slice_list)
+
+        drill_down_results = drill_down.drill_down_results(table, metric,
+                                                           all_dimensions,
+                                                           slice_compare_column,
+                                                           summary_operator,
+                                                           dimensions = dimensions,
+                                                           workers = kwargs.get('workers', 1))
 
     # result_table is the result table requested by user.
-    result_table = aspects.group_by(query_table,
-                                            grouping_columns,
-                                            summary_operator)['table']
+    result_table = drill_down_results['result_table']
+
     # suggestions store the list of debiasing for this oversight.
     suggestions = []
 
-    dimension_list = []
+    dimensions_len = 0
     if dimensions is not None:
-        dimension_list = dimensions.copy()
-
-    dimensions_len = len(dimension_list)
-               
-    for column in operational_dimensions:
-        # we try to find the debiasing for every column which 
-        # is not in the grouping list initially
-        if column not in dimension_list:
-            new_grouping_columns = dimension_list.copy()
-            new_grouping_columns.append(column)
-            new_grouping_columns.append(slice_compare_column)
-
-            new_required_columns = new_grouping_columns.copy()
-            new_required_columns.append(metric)
-            new_cropped_table = aspects.crop_other_columns(table, 
-                                            new_required_columns)
-
-            # result table after adding the new column in the grouping list.
-            new_result_table = aspects.group_by(new_cropped_table,
-                                                new_grouping_columns,
-                                                summary_operator)['table']
-
-            # it will return the debiasing suggestion after comparing the
-            # initial result table and new result table.
-            new_suggestion =  _check_top_down_error(result_table,
-                                                      new_result_table, 
-                                                      column, slice1,
-                                                      dimensions_len)
-            if new_suggestion != None:
-                suggestions.append(new_suggestion)
+        dimensions_len = len(dimensions)
+
+    for (column, new_result_table) in drill_down_results['drill_down_tables']:
+        # it will return the debiasing suggestion after comparing the
+        # initial result table and new result table.
+        new_suggestion = _check_top_down_error(result_table,
+                                               new_result_table,
+                                               column, slice1,
+                                               dimensions_len)
+        if new_suggestion != None:
+            suggestions.append(new_suggestion)
     return suggestions
               
 def _check_top_down_error(result_table, new_result_table, new_added_column,
@@ -177,57 +165,48 @@ def _check_top_down_error(result_table, new_result_table, new_added_column,
         return a dictionary where each dictionary represent a debiasing 
                suggestion according to the new column.
     """
-    num_rows = result_table.shape[0]
-    new_num_rows = new_result_table.shape[0]
-
-    # changing dataframe to list of list to do next set of operation
-    table_matrix = result_table.values.tolist()
-    new_table_matrix = new_result_table.values.tolist()
+    if result_table.shape[0] == 0:
+        return
 
-    row_i = 0
-    new_row_i = 0
+    # the columns are the dimensions, (the new added column),
+    # the slice-compare column & the metric
+    dimensions = list(result_table.columns[:dimensions_len])
+    slice_compare_column = result_table.columns[dimensions_len]
+
+    # one row for every group, with the values of both the slices
+    slices = drill_down.unstack_slices(result_table, dimensions,
+                                       slice_compare_column, slice1)
+    new_slices = drill_down.unstack_slices(new_result_table,
+                                           dimensions + [new_added_column],
+                                           slice_compare_column, slice1)
+
+    # only the groups in which both the slices are present are compared
+    new_slices = new_slices[new_slices['num_slices'] == 2]
+    new_correlation = _calculate_relation(new_slices['slice1_value'],
+                                          new_slices['slice2_value'])
+
+    # level 0 is the single value level added by unstack_slices,
+    # so that grouping by no dimensions is also possible
+    dimension_levels = list(range(dimensions_len + 1))
+
+    # maximum of the correlations in each group, a nan correlation
+    # restarts the maximum from the next one, as the builtin max does
+    is_nan = new_correlation.isna()
+    nan_from_here = is_nan[::-1].groupby(level=dimension_levels, sort=False).cumsum()[::-1]
+    new_max_correlation = new_correlation[nan_from_here == 0].groupby(
+                                level=dimension_levels, sort=False).max()
+    new_max_correlation = new_max_correlation.reindex(slices.index)
+
+    correlation = _calculate_relation(slices['slice1_value'], slices['slice2_value'])
+
+    is_top_down_error = (slices['num_slices'] == 2) & \
+        (new_max_correlation >= constants.TOP_DOWN_ERROR_DISSIMILARITY_THRESHOLD) & \
+        (correlation <= constants.TOP_DOWN_ERROR_SIMILARITY_THRESHOLD)
 
     suggestion_row_list = []
-
-    # dominant percentage is the percentage of pairs where 
-    # (first value - second value) is positive.
-
-    while row_i < num_rows:
-        if row_i == num_rows - 1 or table_matrix[row_i][:dimensions_len] != \
-                                    table_matrix[row_i + 1][:dimensions_len]:
-            while new_row_i < new_num_rows and \
-                  table_matrix[row_i][:dimensions_len] == \
-                  new_table_matrix[new_row_i][:dimensions_len]:
-                new_row_i = new_row_i + 1
-        else:
-            new_max_correlation = 0
-            while new_row_i < new_num_rows and \
-                  table_matrix[row_i][:dimensions_len] == \
-                  new_table_matrix[new_row_i][:dimensions_len]:
-                if new_row_i == new_num_rows - 1 or \
-                new_table_matrix[new_row_i][:dimensions_len + 1] != \
-                new_table_matrix[new_row_i + 1][:dimensions_len + 1]:
-                    max_disimilarity = constants.TOP_DOWN_ERROR_DISSIMILARITY_THRESHOLD
-                else:
-                    correlation = _calculate_relation(
-                        new_table_matrix[new_row_i][dimensions_len + 2], 
-                        new_table_matrix[new_row_i + 1][dimensions_len + 2])
-                    new_max_correlation = max(correlation, new_max_correlation)
-                    new_row_i = new_row_i + 1
-                new_row_i = new_row_i + 1
-               
-            correlation = _calculate_relation(
-                          table_matrix[row_i][dimensions_len + 1], 
-                          table_matrix[row_i + 1][dimensions_len + 1])
-
-            if new_max_correlation >= \
-            constants.TOP_DOWN_ERROR_DISSIMILARITY_THRESHOLD and \
-            correlation <= constants.TOP_DOWN_ERROR_SIMILARITY_THRESHOLD:
-                suggestion_row_list.append({'row': row_i + 1, 'confidence_score':100})
-                suggestion_row_list.append({'row': row_i + 2, 'confidence_score':100})
-            row_i = row_i + 1
-
-        row_i = row_i + 1
+    for position in slices['position'][is_top_down_error]:
+        suggestion_row_list.append({'row': int(position) + 1, 'confidence_score':100})
+        suggestion_row_list.append({'row': int(position) + 2, 'confidence_score':100})
 
     if len(suggestion_row_list) == 0:
         return
@@ -245,17 +224,17 @@ def _calculate_relation(val1, val2):
     This function can find the similarity between two values
 
     Arg:
-        val1: the first value for which we have to compute the similarity
-        val2: the second value for which we have to compute the similarity
+        val1: the first values for which we have to compute the similarity
+        val2: the second values for which we have to compute the similarity
+            Type-pandas Series, compared element-wise
 
     Returns:
         return the similarity between both the arguments calculated by the
         formula
         similarity = |val1 - val2| / (|val1| + |val2|)
+        and 0 where both the values are 0
     """
+    denominator = val1.abs() + val2.abs()
+    result = (val1 - val2).abs() / denominator
 
-    if abs(val1) + abs(val2) == 0:
-        return 0
-    result = abs(val1 - val2) / (abs(val1) + abs(val2))
-
-    return result
\ No newline at end of file
+    return result.mask(denominator == 0, 0)
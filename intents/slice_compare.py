@@ -21,13 +21,14 @@ slicing(removing rows that do not follow the conditions), group by.
 Some of the operations are optional.
 """
 
-from util import aspects, oversights_order, rank_oversights
+from util import aspects, date_module, oversights_order, rank_oversights
 from oversights.simpsons_paradox import simpsons_paradox
 from oversights.calendar_vs_experience_time import calendar_vs_experience_time
 from oversights.benchmark_set_too_different import benchmark_set_too_different
 from oversights.top_down_error import top_down_error
+from oversights import drill_down
 from util.enums import SummaryOperators, Filters
-import pandas
+import itertools
 
 def slice_compare(table, metric, all_dimensions, all_metric,
                       slice_compare_column, slice1, slice2,
@@ -74,6 +75,16 @@ def slice_compare(table, metric, all_dimensions, all_metric,
         summary_operator: Type-summary_operators enum members
             It denotes the summary operator, after grouping by dimensions.
             ex. SummaryOperators.MAX, SummaryOperators.SUM
+        workers: Type-int
+            Number of processes used to compute the groupings by every
+            other dimension for the oversights. Default 1, computed in
+            the calling process.
+        slice_values: Type-list
+            more values of the slice-compare column to be compared, after
+            slice1 & slice2. All the slices are in the same result table,
+            and the oversights are checked for every 2 of the slices, a
+            suggestion found for more than one pair is given once with the
+            rows of all of them. Not supported if slice2 is '*'.
 
     Note-summary_operator is always applied on metric column passed,
          and only when grouping is done
@@ -91,6 +102,15 @@ def slice_compare(table, metric, all_dimensions, all_metric,
 
     dimensions = kwargs.get('dimensions', None)
 
+    workers = kwargs.get('workers', 1)
+
+    slice_values = [slice1, slice2]
+    if kwargs.get('slice_values', None) is not None:
+        slice_values = slice_values + kwargs.get('slice_values')
+
+    if slice2 == "*" and len(slice_values) > 2:
+        raise Exception("More slices can not be compared along with '*'")
+
     if slice2 == "*":
         result_tuple = _slice_compare_results_for_all(table, metric,
                                                       slice_compare_column,
@@ -119,47 +139,86 @@ def slice_compare(table, metric, all_dimensions, all_metric,
 
         return (result_table, suggestions)
 
-    result_tuple = _slice_compare_results(table, metric, slice_compare_column,
-                                          slice1, slice2, summary_operator,
-                                          slices = slices, dimensions = dimensions,
-                                          date_column_name = date_column_name,
-                                          date_range = date_range, 
-                                          day_first = day_first)
+    # the date range, the slices and the condition to keep only the
+    # compared slices are applied once, the results & all the oversights
+    # are computed on this table
+    base_table = _oversights_base_table(table, metric, all_dimensions,
+                                        slice_compare_column, slice_values,
+                                        slices = slices, dimensions = dimensions,
+                                        date_column_name = date_column_name,
+                                        date_range = date_range,
+                                        day_first = day_first)
 
-    result_table = result_tuple[0]
+    result_tuple = _slice_compare_results(base_table, metric, slice_compare_column,
+                                          slice_values, summary_operator,
+                                          dimensions = dimensions)
 
-    suggestions = result_tuple[1]
+    result_table = result_tuple[0]
 
-    simpsons_paradox_suggestion = simpsons_paradox(table, metric, all_dimensions,
+    suggestions = []
+
+    # the grouped results used by both simpson's paradox & top-down error,
+    # computed once for all the slices
+    drill_down_results = drill_down.drill_down_results(base_table, metric,
+                                                       all_dimensions,
+                                                       slice_compare_column,
+                                                       summary_operator,
+                                                       dimensions = dimensions,
+                                                       workers = workers)
+
+    # the dates are parsed once for checking all the pairs of slices
+    row_dates = None
+    if date_range is not None and dimensions is None:
+        row_dates = date_module.str_to_datetime_column(base_table[date_column_name],
+                                                       day_first)
+
+    calendar_vs_experience_time_suggestion = None
+
+    for (slice1, slice2) in itertools.combinations(slice_values, 2):
+        slices_drill_down_results = drill_down.keep_slices(drill_down_results,
+                                                           slice_compare_column,
+                                                           [slice1, slice2])
+
+        simpsons_paradox_suggestion = simpsons_paradox(base_table, metric, all_dimensions,
+                                                       slice_compare_column, slice1,
+                                                       slice2, summary_operator,
+                                                       dimensions = dimensions,
+                                                       drill_down_results = slices_drill_down_results)
+
+        top_down_error_suggestion = top_down_error(base_table, metric, all_dimensions,
                                                    slice_compare_column, slice1,
                                                    slice2, summary_operator,
                                                    dimensions = dimensions,
-                                                   date_column_name = date_column_name,
-                                                   date_range = date_range, 
-                                                   day_first = day_first,
-                                                   slices = slices)
-
-    top_down_error_suggestion = top_down_error(table, metric, all_dimensions,
-                                               slice_compare_column, slice1,
-                                               slice2, summary_operator,
-                                               dimensions = dimensions,
-                                               date_column_name = date_column_name,
-                                               date_range = date_range, 
-                                               day_first = day_first,
-                                               slices = slices)
-
-    calendar_vs_experience_time_suggestion = calendar_vs_experience_time(table, metric, all_dimensions,
-                                                                         slice_compare_column, slice1,
-                                                                         slice2, summary_operator,
-                                                                         dimensions = dimensions,
-                                                                         date_column_name = date_column_name,
-                                                                         date_range = date_range, 
-                                                                         day_first = day_first,
-                                                                         slices = slices)
-    suggestions = simpsons_paradox_suggestion + top_down_error_suggestion
+                                                   drill_down_results = slices_drill_down_results)
+
+        # rows of the suggestions are the rows of the results of the 2
+        # slices, they are changed to the rows in the result table
+        slices_result_index = slices_drill_down_results['result_table'].index
+        for suggestion in simpsons_paradox_suggestion + top_down_error_suggestion:
+            for row_suggestion in suggestion['row_list']:
+                row_suggestion['row'] = int(slices_result_index[row_suggestion['row'] - 1]) + 1
+            suggestions.append(suggestion)
+
+        # the oversight depends on the pair of slices(their first dates),
+        # but the message is the same for every pair, so a single
+        # suggestion is kept on purpose - of the first pair that shows it
+        if calendar_vs_experience_time_suggestion is None:
+            calendar_vs_experience_time_suggestion = calendar_vs_experience_time(base_table, metric, all_dimensions,
+                                                                                 slice_compare_column, slice1,
+                                                                                 slice2, summary_operator,
+                                                                                 dimensions = dimensions,
+                                                                                 date_column_name = date_column_name,
+                                                                                 date_range = date_range, 
+                                                                                 day_first = day_first,
+                                                                                 prefiltered = True,
+                                                                                 row_dates = row_dates)
 
     if calendar_vs_experience_time_suggestion is not None:
-      suggestions.append(calendar_vs_experience_time)
+      suggestions.append(calendar_vs_experience_time_suggestion)
+
+    # the same message found for different pairs of slices is given once,
+    # with the rows of all the pairs
+    suggestions = rank_oversights.merge_suggestions(suggestions)
 
     order = oversights_order.ORDER_IN_SLICE_COMPARE
 
@@ -171,7 +230,7 @@ def slice_compare(table, metric, all_dimensions, all_metric,
     return (result_table, suggestions)
 
 def _slice_compare_results(table, metric, slice_compare_column,
-                           slice1, slice2, summary_operator, **kwargs):
+                           slice_values, summary_operator, **kwargs):
     """This function will implement the slice-compare intent
 
     Also removes the tuples that do not lie in the given date range.
@@ -210,6 +269,8 @@ https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
             first element denotes the column name by which we will do comparision.
             rest elements will the value belongs to that column by which we
             will compare the slices.
+        slice_values: Type-list
+            the values of the slice-compare column that are compared
         summary_operator: Type-summary_operators enum members
             It denotes the summary operator, after grouping by dimensions.
             ex. SummaryOperators.MAX, SummaryOperators.SUM
@@ -237,11 +298,11 @@ https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
                                      date_column_name, 
                                      day_first)
 
-    if slices == None:
-        slices = [(slice_compare_column, Filters.IN, [slice1, slice2])]
-    else:
-        slices.append((slice_compare_column, Filters.IN, [slice1, slice2]))
-    table = aspects.slice_table(table, slices)
+    slice_list = []
+    if slices is not None:
+        slice_list = slices.copy()
+    slice_list.append((slice_compare_column, Filters.IN, slice_values))
+    table = aspects.slice_table(table, slice_list)
 
     # collecting the colums not to be removed
     required_columns = []
@@ -267,6 +328,73 @@ https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
 
     return (result_table, suggestions)
 
+def _oversights_base_table(table, metric, all_dimensions, slice_compare_column,
+                           slice_values, **kwargs):
+    """This function applies the date range, the slices and the condition
+    to keep only the rows of the compared slices on the table, and removes the
+    columns that are used neither by the results nor by the oversights.
+    The results and the oversights of the slice-compare intent are all
+    computed on the table returned, instead of filtering the table again
+    for each of them.
+
+    Args:
+        table: Type-pandas.dataframe
+            It has the contents of the csv file
+        metric: Type-string
+            It is the name of the column on which summary operator is applied.
+        all_dimensions: Type-list of str
+            It is the list of dimension columns in the initial table
+        slice_compare_column: Type-string
+            name of the slice-compare column.
+        slice_values: Type-list
+            the values of the slice-compare column that are compared
+        dimensions: Type-list of str
+            It is the name of column we group by.
+        date_range: Type-tuple
+            Tuple of start_date and end_date
+        date_column_name: Type-str
+            It is the name of column which contains date
+        day_first: Type-str
+            Day_first denotes that does day in the date occurs before month in the
+            dates in the date column
+        slices: Type-List of tuples
+            Tuple represents the conditon to keep the row.
+            (column_name, filter, value)
+
+    Returns:
+        The filtered table, Type-pandas.dataframe
+    """
+    date_column_name = kwargs.get('date_column_name', 'date')
+    date_range = kwargs.get('date_range', None)
+    day_first = kwargs.get('day_first', False)
+
+    slices = kwargs.get('slices', None)
+
+    dimensions = kwargs.get('dimensions', None)
+
+    table = aspects.apply_date_range(table, date_range,
+                                     date_column_name, day_first)
+
+    slice_list = []
+    if slices is not None:
+        slice_list = slices.copy()
+    slice_list.append((slice_compare_column, Filters.IN, slice_values))
+
+    table = aspects.slice_table(table, slice_list)
+
+    # collecting the colums not to be removed
+    required_columns = all_dimensions.copy()
+    if dimensions is not None:
+        required_columns = required_columns + dimensions
+    required_columns.append(slice_compare_column)
+    required_columns.append(metric)
+    if date_range is not None:
+        required_columns.append(date_column_name)
+
+    table = aspects.crop_other_columns(table, required_columns)
+
+    return table
+
 def _slice_compare_results_for_all(table, metric, slice_compare_column,
                                    slice1, slice2, summary_operator, **kwargs):
     
@@ -346,22 +474,16 @@ https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior
 
     table = aspects.crop_other_columns(table, required_columns)
 
-    required_table_for_one = aspects.slice_table(table, [(slice_compare_column, 
-                                                   Filters.EQUAL_TO, slice1)])
-    
-    required_table_for_all = table.copy()
-    required_table_for_all[slice_compare_column] = 'ALL'
-
-    updated_table = pandas.concat([required_table_for_all, required_table_for_one])
-    updated_table = updated_table.reset_index(drop = True)
-
     # collecting the colums on whcih we shall do grouping
     grouping_columns = []
     if dimensions is not None:
         grouping_columns = dimensions.copy()
-    grouping_columns.append(slice_compare_column)
-    
-    after_group_by = aspects.group_by(updated_table, grouping_columns, summary_operator)
+
+    # slice1 is compared with the whole table labelled as 'ALL'
+    after_group_by = aspects.group_by_slice_and_all(table, grouping_columns,
+                                                    slice_compare_column, slice1,
+                                                    'ALL', summary_operator,
+                                                    all_first = True)
 
     result_table = after_group_by['table']
 
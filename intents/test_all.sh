@@ -86,6 +86,14 @@ else
   list_logs+=("test_time_compare passed")
 fi
 
+if ! python3 test_main.py;
+then
+  err "test_main failed"
+  list_logs+=("test_main failed")
+else
+  list_logs+=("test_main passed")
+fi
+
 if ! python3 util/test_aspects.py;
 then
   err "util/test_aspects failed"
@@ -94,6 +102,14 @@ else
   list_logs+=("util/test_aspects passed")
 fi
 
+if ! python3 util/test_dataset_cache.py;
+then
+  err "util/test_dataset_cache failed"
+  list_logs+=("util/test_dataset_cache failed")
+else
+  list_logs+=("util/test_dataset_cache passed")
+fi
+
 if ! python3 util/test_insert_as_column.py;
 then
   err "util/test_insert_as_column failed"
@@ -103,6 +119,30 @@ else
 fi
 
 
+if ! python3 util/test_column_profile.py;
+then
+  err "util/test_column_profile failed"
+  list_logs+=("util/test_column_profile failed")
+else
+  list_logs+=("util/test_column_profile passed")
+fi
+
+if ! python3 util/test_result_cache.py;
+then
+  err "util/test_result_cache failed"
+  list_logs+=("util/test_result_cache failed")
+else
+  list_logs+=("util/test_result_cache passed")
+fi
+
+if ! python3 util/test_downsample.py;
+then
+  err "util/test_downsample failed"
+  list_logs+=("util/test_downsample failed")
+else
+  list_logs+=("util/test_downsample passed")
+fi
+
 if ! python3 util/test_rank_oversights.py;
 then
   err "util/test_rank_oversights failed"
@@ -151,6 +191,14 @@ else
   list_logs+=("oversights/test_top_down_error passed")
 fi
 
+if ! python3 oversights/test_regression_to_mean.py;
+then
+  err "oversights/test_regression_to_mean failed"
+  list_logs+=("oversights/test_regression_to_mean failed")
+else
+  list_logs+=("oversights/test_regression_to_mean passed")
+fi
+
 if ! python3 oversights/test_looking_at_tails.py;
 then
   err "oversights/test_looking_at_tails failed"
@@ -153,6 +153,141 @@ def test_4():
 
     assert(expected_suggestions == str(suggestions))
 
+def test_5():
+    """
+    Query : Find correlation between every pair of math score, reading score and writing score for each gender
+    Dataset used - https://www.kaggle.com/spscientist/students-performance-in-exams
+    Columns : gender, math score, reading score, writing score
+    """
+    table = pandas.read_csv('data/data_for_test_correlation/students_performance.csv')
+
+    result_table, suggestions = correlation.correlation_matrix(table,
+                                                               ['math score', 'reading score', 'writing score'],
+                                                               dimensions=['gender'])
+
+    print(result_table.to_string())
+    print(suggestions)
+
+    expected_result_table = """   gender         metric  math score  reading score  writing score
+0  female     math score    1.000000       0.909254       0.920729
+1  female  reading score    0.909254       1.000000       0.954725
+2  female  writing score    0.920729       0.954725       1.000000
+3    male     math score    1.000000       0.885489       0.891973
+4    male  reading score    0.885489       1.000000       0.950627
+5    male  writing score    0.891973       0.950627       1.000000"""
+
+    assert(expected_result_table == result_table.to_string())
+
+    expected_suggestions = """[]"""
+
+    assert(expected_suggestions == str(suggestions))
+
+def test_6():
+    """
+    Query : Find correlation between runs and wickets for each team
+    Team B has a single row and the wickets of team C are constant,
+    so their correlation is not defined.
+    """
+    table = pandas.DataFrame({'team': ['A', 'A', 'A', 'B', 'C', 'C'],
+                              'runs': [10, 20, 30, 40, 50, 60],
+                              'wickets': [1, 3, 2, 4, 5, 5]})
+
+    result_table, suggestions = correlation.correlation(table, 'runs', 'wickets',
+                                                        dimensions=['team'])
+
+    print(result_table.to_string())
+    print(suggestions)
+
+    expected_result_table = """  team  correlation between "runs" , "wickets"
+0    A                                     0.5
+1    B                                     NaN
+2    C                                     NaN"""
+
+    assert(expected_result_table == result_table.to_string())
+
+    expected_suggestions = """[]"""
+
+    assert(expected_suggestions == str(suggestions))
+
+def test_7():
+    """
+    Query : Find correlation between runs and wickets for each team
+    The metrics of team B are about 1e9 more than those of team A, the
+    correlation of both the teams is the same.
+    """
+    table = pandas.DataFrame({'team': ['A', 'A', 'A', 'A', 'B', 'B', 'B', 'B'],
+                              'runs': [1, 2, 3, 4, 1e9 + 1, 1e9 + 2, 1e9 + 3, 1e9 + 4],
+                              'wickets': [2, 1, 4, 3, 1e9 + 2, 1e9 + 1, 1e9 + 4, 1e9 + 3]})
+
+    result_table, suggestions = correlation.correlation(table, 'runs', 'wickets',
+                                                        dimensions=['team'])
+
+    print(result_table.to_string())
+    print(suggestions)
+
+    expected_result_table = """  team  correlation between "runs" , "wickets"
+0    A                                     0.6
+1    B                                     0.6"""
+
+    assert(expected_result_table == result_table.to_string())
+
+    expected_suggestions = """[]"""
+
+    assert(expected_suggestions == str(suggestions))
+
+def test_8():
+    """
+    Query : Find correlation between every pair of runs and wickets in January 2020
+    The dates are month first, only the first 3 rows are in the date range.
+    """
+    table = pandas.DataFrame({'date': ['01/02/2020', '01/03/2020', '01/04/2020', '02/01/2020'],
+                              'runs': [1, 2, 4, 3],
+                              'wickets': [2, 1, 4, 9]})
+
+    result_table, suggestions = correlation.correlation_matrix(table, ['runs', 'wickets'],
+                                                               date_range=('2020-01-01', '2020-01-31'),
+                                                               date_column_name='date',
+                                                               day_first=False)
+
+    print(result_table.to_string())
+    print(suggestions)
+
+    expected_result_table = """    metric      runs   wickets
+0     runs  1.000000  0.785714
+1  wickets  0.785714  1.000000"""
+
+    assert(expected_result_table == result_table.to_string())
+
+    expected_suggestions = """[]"""
+
+    assert(expected_suggestions == str(suggestions))
+
+def test_9():
+    """
+    Query : Find correlation between runs and wickets in January 2020
+    The dates are month first, only the first 3 rows are in the date range.
+    """
+    table = pandas.DataFrame({'date': ['01/02/2020', '01/03/2020', '01/04/2020', '02/01/2020'],
+                              'runs': [1, 2, 4, 3],
+                              'wickets': [2, 1, 4, 9]})
+
+    result_table, suggestions = correlation.correlation(table, 'runs', 'wickets',
+                                                        date_range=('2020-01-01', '2020-01-31'),
+                                                        date_column_name='date',
+                                                        day_first=False)
+
+    print(result_table.to_string())
+    print(suggestions)
+
+    expected_result_table = """   correlation between "runs" , "wickets"
+0                                0.785714"""
+
+    assert(expected_result_table == result_table.to_string())
+
+    expected_suggestions = """[]"""
+
+    assert(expected_suggestions == str(suggestions))
+
 
 print(test_1.__doc__)
 test_1()
@@ -160,6 +295,21 @@ test_1()
 print(test_2.__doc__)
 test_2()
 
+print(test_5.__doc__)
+test_5()
+
+print(test_6.__doc__)
+test_6()
+
+print(test_7.__doc__)
+test_7()
+
+print(test_8.__doc__)
+test_8()
+
+print(test_9.__doc__)
+test_9()
+
 print(test_3.__doc__)
 test_3()
 
@@ -0,0 +1,50 @@
+"""
+Copyright 2020 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+https://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""This module has some tests to test the conversion of the table
+passed in the request json into a pandas dataframe.
+The tables used are hardcoded in the functions.
+"""
+
+import pandas
+import main
+
+def test_1():
+    """
+    Column-major table with a string column that has
+    an empty string cell and a missing(None) cell.
+    The empty string is kept as a value, the missing cell stays missing.
+    """
+    table = {'header': ['name', 'runs'],
+             'columns': [['A', '', None, 'B'], ['10', '20', '', '40']],
+             'types': ['string', 'number']}
+
+    query_table_dataframe, table_header = main._table_to_dataframe(table)
+
+    print(query_table_dataframe)
+    expected_table = """  name  runs
+0    A  10.0
+1       20.0
+2  NaN   NaN
+3    B  40.0"""
+
+    assert(expected_table == query_table_dataframe.to_string())
+    assert(query_table_dataframe['name'].isna().tolist() == [False, False, True, False])
+    assert(list(query_table_dataframe.groupby('name').size().index) == ['', 'A', 'B'])
+
+print(test_1.__doc__)
+test_1()
+
+print('Test cases completed')
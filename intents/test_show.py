@@ -284,7 +284,7 @@ def test_9():
 1     Palo Alto          3.033333e+04
 2    Washington          2.002740e+07"""
 
-    expected_suggestions = "[{'suggestion': 'Median is very different from the Mean', 'oversight': <Oversights.MEAN_VS_MEDIAN: 7>, 'is_row_level_suggestion': True, 'confidence_score': 3.1249999406334665, 'row_list': [{'row': 3, 'confidence_score': 3.1249999406334665}]}]"
+    expected_suggestions = "[{'suggestion': 'Median is very different from the Mean', 'oversight': <Oversights.MEAN_VS_MEDIAN: 7>, 'is_row_level_suggestion': True, 'confidence_score': 3.124999940633465, 'row_list': [{'row': 3, 'confidence_score': 3.124999940633465}]}]"
 
     assert(expected_result == query_result[0].to_string())
     assert(expected_suggestions == str(query_result[1]))
@@ -149,6 +149,58 @@ def test_5():
     assert(expected_output == query_result[0].to_string())
     assert(expected_suggestion == str(query_result[1]))
 
+def test_6():
+    """
+        question :  compare the share of score of player A and all the players by team.
+     """
+    table = pandas.DataFrame({'team': ['X', 'X', 'Y', 'Y', 'X', 'Y'],
+                              'player': ['A', 'B', 'A', 'B', 'A', 'C'],
+                              'score': [10, -4, 6, 8, 2, 5]})
+    query_result = slice_compare.slice_compare(table, 'score', ['team', 'player'], ['score'],
+                                               'player', 'A', '*',
+                                               SummaryOperators.PROPORTION_OF_SUM,
+                                               dimensions = ['team'])
+    print(query_result)
+
+    expected_output = """  team player     score
+0    X      A  0.266667
+1    X    ALL  0.177778
+2    Y      A  0.133333
+3    Y    ALL  0.422222"""
+    expected_suggestion = "[{'suggestion': 'There exists negative values among the values on which proportion is being applied', 'oversight': <Oversights.ATTRIBUTION_WITH_HIDDEN_NEGATIVES: 11>, 'is_row_level_suggestion': True, 'confidence_score': 1, 'row_list': [{'row': 2, 'confidence_score': 1}]}]"
+
+    assert(expected_output == query_result[0].to_string())
+    assert(expected_suggestion == str(query_result[1]))
+
+def test_7():
+    """
+        An example from the IPL dataset
+        question :  compare average win_by_runs for each toss_decision in seasons 2009, 2010 and 2011.
+        Every pair of the slices is compared, the top-down error by winner
+        between 2009 & 2010 on the rows of 'bat' and between 2010 & 2011 on
+        the rows of 'field' is given once, with the rows of both the pairs.
+     """
+    table = pandas.read_csv('data/matches.csv')
+    query_result = slice_compare.slice_compare(table, 'win_by_runs',
+                                               ['winner', 'city', 'toss_decision', 'season'],
+                                               ['win_by_runs'], 'season', 2009, 2010,
+                                               SummaryOperators.MEAN,
+                                               dimensions = ['toss_decision'],
+                                               slice_values = [2011])
+    print(query_result)
+
+    expected_output = """  toss_decision  season  MEAN of win_by_runs
+0           bat    2009            16.600000
+1           bat    2010            16.128205
+2           bat    2011            12.920000
+3         field    2009             8.318182
+4         field    2010            16.523810
+5         field    2011            16.145833"""
+    expected_suggestion = "[{'suggestion': 'Some values are similar here but will vary if we add winner for grouping ', 'oversight': <Oversights.TOP_DOWN_ERROR: 9>, 'is_row_level_suggestion': True, 'row_list': [{'row': 1, 'confidence_score': 100}, {'row': 2, 'confidence_score': 100}, {'row': 5, 'confidence_score': 100}, {'row': 6, 'confidence_score': 100}]}, {'suggestion': 'Some values are similar here but will vary if we add city for grouping ', 'oversight': <Oversights.TOP_DOWN_ERROR: 9>, 'is_row_level_suggestion': True, 'row_list': [{'row': 5, 'confidence_score': 100}, {'row': 6, 'confidence_score': 100}]}, {'suggestion': 'the relation between slices might changed a lot if you will consider winner in grouping.', 'oversight': <Oversights.SIMPSONS_PARADOX: 8>, 'is_row_level_suggestion': True, 'row_list': [{'row': 5, 'confidence_score': 100}, {'row': 6, 'confidence_score': 100}]}]"
+
+    assert(expected_output == query_result[0].to_string())
+    assert(expected_suggestion == str(query_result[1]))
+
 print("\ncompare total runs of 'Mumbai indians' and 'Chennai Super Kings'")
 test_1()
 
@@ -164,4 +216,10 @@ test_4()
 print("\ncompare average score of A and B by class.")
 test_5()
 
+print("\ncompare the share of score of player A and all the players by team.")
+test_6()
+
+print("\ncompare average win_by_runs for each toss_decision in seasons 2009, 2010 and 2011.")
+test_7()
+
 print("\nTest cases completed")
\ No newline at end of file
@@ -76,10 +76,43 @@ def test_2():
     assert(expected_result == query_result[0].to_string())
     assert(expected_suggestions == str(query_result[1]))
 
+def test_3():
+    """
+        An example from the IPL dataset
+        question :  Compare average win_by_runs for each toss_decision in 2009, 2010 and 2011.
+        Every window is compared with the next one, the top-down error by
+        winner between 2009 & 2010 on the rows of 'bat' and between 2010 & 2011
+        on the rows of 'field' is given once, with the rows of both the pairs.
+    """
+    table = pandas.read_csv('data/matches.csv')
+    query_result = time_compare.time_compare(table, 'win_by_runs',
+                                             ['winner', 'city', 'toss_decision', 'date'],
+                                             'date', ('2009-01-01', '2009-12-31'),
+                                             ('2010-01-01', '2010-12-31'), False,
+                                             SummaryOperators.MEAN,
+                                             dimensions = ['toss_decision'],
+                                             date_ranges = [('2011-01-01', '2011-12-31')])
+    print(query_result)
+
+    expected_result = """  toss_decision                     date  MEAN of win_by_runs
+0           bat  2009-01-01 - 2009-12-31            16.600000
+1           bat  2010-01-01 - 2010-12-31            16.128205
+2           bat  2011-01-01 - 2011-12-31            12.920000
+3         field  2009-01-01 - 2009-12-31             8.318182
+4         field  2010-01-01 - 2010-12-31            16.523810
+5         field  2011-01-01 - 2011-12-31            16.145833"""
+    expected_suggestions = "[{'suggestion': 'Median is very different from the Mean', 'oversight': <Oversights.MEAN_VS_MEDIAN: 7>, 'is_row_level_suggestion': True, 'confidence_score': 3.2328939608742338, 'row_list': [{'row': 3, 'confidence_score': 3.2328939608742338}, {'row': 4, 'confidence_score': 3.311250664310224}]}, {'suggestion': 'Some values are similar here but will vary if we add winner for grouping ', 'oversight': <Oversights.TOP_DOWN_ERROR: 9>, 'is_row_level_suggestion': True, 'row_list': [{'row': 1, 'confidence_score': 100}, {'row': 2, 'confidence_score': 100}, {'row': 5, 'confidence_score': 100}, {'row': 6, 'confidence_score': 100}]}, {'suggestion': 'Some values are similar here but will vary if we add city for grouping ', 'oversight': <Oversights.TOP_DOWN_ERROR: 9>, 'is_row_level_suggestion': True, 'row_list': [{'row': 5, 'confidence_score': 100}, {'row': 6, 'confidence_score': 100}]}, {'suggestion': 'the relation between slices might changed a lot if you will consider winner in grouping.', 'oversight': <Oversights.SIMPSONS_PARADOX: 8>, 'is_row_level_suggestion': True, 'row_list': [{'row': 5, 'confidence_score': 100}, {'row': 6, 'confidence_score': 100}]}]"
+
+    assert(expected_result == query_result[0].to_string())
+    assert(expected_suggestions == str(query_result[1]))
+
 print("\nCompare total_run of team_name ‘MI’ in date_comparision_colum in between ranges 01/01/2008 - 31/12/2009 and 01/01/2010 - 31/12/2011")
 test_1()
 
 print("\nCompare total number of match played by 'England and Wales' from '1871-11-30' to '1950-12-30' and '1950-12-31' to '2020-01-01' in 'England'")
 test_2()
 
+print("\nCompare average win_by_runs for each toss_decision in 2009, 2010 and 2011")
+test_3()
+
 print("\nTest cases completed")
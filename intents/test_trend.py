@@ -42,7 +42,176 @@ def test_1():
     assert(expected_result == query_result[0].to_string())
     assert(expected_suggestions == str(query_result[1]))
 
+def test_2():
+    """An example from the IPL dataset
+    question : quarterly trend of total win_by_runs over date range 2008-04-01 to 2009-06-30
+    """
+    table = pandas.read_csv('data/matches.csv')
+    query_result = trend.trend(table, 'win_by_runs', Granularities.QUARTERLY,
+                                SummaryOperators.SUM,
+                                date_range=('2008-04-01', '2009-06-30'),
+                                date_column_name='date',
+                                day_first=False,
+                                fill_value=0)
+
+    print(query_result)
+
+    expected_result = """         date  win_by_runs
+0  2008-04-01          705
+1  2008-07-01            0
+2  2008-10-01            0
+3  2009-01-01            0
+4  2009-04-01          764"""
+    expected_suggestions = "[]"
+
+    assert(expected_result == query_result[0].to_string())
+    assert(expected_suggestions == str(query_result[1]))
+
+def test_3():
+    """
+    question : quarterly trend of avg sales, with 0 sales in the quarters without any sale
+    Dataset used - hardcoded(values are artificial)
+    The suggestion of the last quarter points to its row after the empty quarters are added.
+    """
+    table = pandas.DataFrame()
+    table['date'] = pandas.Series(['2020-01-10', '2020-02-10', '2020-03-10'] + ['2020-11-10'] * 10)
+    table['sales'] = pandas.Series([10, 20, 30] + [1] * 9 + [100])
+    query_result = trend.trend(table, 'sales', Granularities.QUARTERLY,
+                                SummaryOperators.MEAN,
+                                date_column_name='date',
+                                day_first=False,
+                                fill_value=0)
+
+    print(query_result)
+
+    expected_result = """         date  sales
+0  2020-01-01   20.0
+1  2020-04-01    0.0
+2  2020-07-01    0.0
+3  2020-10-01   10.9"""
+    expected_suggestions = "[{'suggestion': 'Median is very different from the Mean', 'oversight': <Oversights.MEAN_VS_MEDIAN: 7>, 'is_row_level_suggestion': True, 'confidence_score': 3.7037037037037046, 'row_list': [{'row': 4, 'confidence_score': 3.7037037037037046}]}]"
+
+    assert(expected_result == query_result[0].to_string())
+    assert(expected_suggestions == str(query_result[1]))
+
+def test_4():
+    """An example from the IPL dataset
+    question : annual trend of total win_by_runs with its rolling mean over 2 years and cumulative sum
+    """
+    table = pandas.read_csv('data/matches.csv')
+    query_result = trend.trend(table, 'win_by_runs', Granularities.ANNUALLY,
+                                SummaryOperators.SUM,
+                                date_range=('2008-01-01', '2011-12-31'),
+                                date_column_name='date',
+                                day_first=False,
+                                smoothing=[Smoothings.ROLLING_MEAN, Smoothings.CUMULATIVE_SUM],
+                                window=2)
+
+    print(query_result)
+
+    expected_result = """         date  win_by_runs  ROLLING_MEAN of win_by_runs  CUMULATIVE_SUM of win_by_runs
+0  2008-01-01          705                        705.0                            705
+1  2009-01-01          764                        734.5                           1469
+2  2010-01-01          976                        870.0                           2445
+3  2011-01-01         1098                       1037.0                           3543"""
+    expected_suggestions = "[]"
+
+    assert(expected_result == query_result[0].to_string())
+    assert(expected_suggestions == str(query_result[1]))
+
+def test_5():
+    """An example from the IPL dataset
+    question : annual trend of avg win_by_runs of Chennai Super Kings and Mumbai Indians, one column for each winner
+    """
+    table = pandas.read_csv('data/matches.csv')
+    query_result = trend.trend(table, 'win_by_runs', Granularities.ANNUALLY,
+                                SummaryOperators.MEAN,
+                                date_range=('2008-01-01', '2010-12-31'),
+                                date_column_name='date',
+                                day_first=False,
+                                slices=[('winner', Filters.IN, ['Chennai Super Kings', 'Mumbai Indians'])],
+                                dimensions=['winner'])
+
+    print(query_result)
+
+    expected_result = """         date  Chennai Super Kings  Mumbai Indians
+0  2008-01-01             8.111111        7.714286
+1  2009-01-01            32.750000       27.200000
+2  2010-01-01            18.000000       34.000000"""
+    expected_suggestions = "[{'suggestion': 'Median is very different from the Mean', 'oversight': <Oversights.MEAN_VS_MEDIAN: 7>, 'is_row_level_suggestion': True, 'confidence_score': 2.8150853010934718, 'row_list': [{'row': 2, 'confidence_score': 2.8150853010934718, 'column': 'Mumbai Indians'}]}]"
+
+    assert(expected_result == query_result[0].to_string())
+    assert(expected_suggestions == str(query_result[1]))
+
+def test_6():
+    """An example from the IPL dataset
+    question : monthly trend of avg win_by_runs over 2008 to 2011 in at most 4 points
+    """
+    table = pandas.read_csv('data/matches.csv')
+    query_result = trend.trend(table, 'win_by_runs', Granularities.MONTHLY,
+                                SummaryOperators.MEAN,
+                                date_range=('2008-01-01', '2011-12-31'),
+                                date_column_name='date',
+                                day_first=False,
+                                max_points=4)
+
+    print(query_result)
+
+    expected_result = """         date  win_by_runs
+0  2008-04-01    15.764706
+1  2008-06-01     0.000000
+2  2011-04-01    10.277778
+3  2011-05-01    19.675676"""
+    expected_suggestions = "[{'suggestion': 'Median is very different from the Mean', 'oversight': <Oversights.MEAN_VS_MEDIAN: 7>, 'is_row_level_suggestion': True, 'confidence_score': 3.2423585883738166, 'row_list': [{'row': 1, 'confidence_score': 3.2423585883738166}]}]"
+
+    assert(expected_result == query_result[0].to_string())
+    assert(expected_suggestions == str(query_result[1]))
+
+def test_7():
+    """An example from the IPL dataset
+    question : monthly trend of total win_by_runs of Chennai Super Kings and Mumbai Indians over 2008 to 2011 in at most 4 points, one column for each winner
+    """
+    table = pandas.read_csv('data/matches.csv')
+    query_result = trend.trend(table, 'win_by_runs', Granularities.MONTHLY,
+                                SummaryOperators.SUM,
+                                date_range=('2008-01-01', '2011-12-31'),
+                                date_column_name='date',
+                                day_first=False,
+                                slices=[('winner', Filters.IN, ['Chennai Super Kings', 'Mumbai Indians'])],
+                                dimensions=['winner'],
+                                max_points=4)
+
+    print(query_result)
+
+    expected_result = """         date  Chennai Super Kings  Mumbai Indians
+0  2008-04-01                   52               0
+1  2009-04-01                  130             111
+2  2011-04-01                   48              45
+3  2011-05-01                  169              76"""
+    expected_suggestions = "[]"
+
+    assert(expected_result == query_result[0].to_string())
+    assert(expected_suggestions == str(query_result[1]))
+
 print(test_1.__doc__)
 test_1()
 
+print(test_2.__doc__)
+test_2()
+
+print(test_3.__doc__)
+test_3()
+
+print(test_4.__doc__)
+test_4()
+
+print(test_5.__doc__)
+test_5()
+
+print(test_6.__doc__)
+test_6()
+
+print(test_7.__doc__)
+test_7()
+
 print("Test cases completed")
\ No newline at end of file
@@ -21,10 +21,12 @@ slicing(removing rows that do not follow the conditions), group by.
 Some of the operations are optional.
 """
 
-from util import aspects, oversights_order, rank_oversights
+from util import aspects, date_module, oversights_order, rank_oversights
+import numpy
 import pandas
 from oversights.simpsons_paradox import simpsons_paradox
 from oversights.top_down_error import top_down_error
+from oversights import drill_down
 
 def time_compare(table, metric, all_dimensions, time_compare_column, date_range1, 
                            date_range2, day_first, summary_operator, **kwargs):
@@ -68,6 +70,16 @@ def time_compare(table, metric, all_dimensions, time_compare_column, date_range1
         summary_operator: Type-summary_operators enum members
             It denotes the summary operator, after grouping by dimensions.
             ex. SummaryOperators.MAX, SummaryOperators.SUM
+        workers: Type-int
+            Number of processes used to compute the groupings by every
+            other dimension for the oversights. Default 1, computed in
+            the calling process.
+        date_ranges: Type-list of tuples of start_date and end_date
+            more date ranges to be compared, after date_range1 & date_range2.
+            All the date ranges are in the same result table, and the
+            oversights are checked for every 2 consecutive date ranges, a
+            suggestion found for more than one pair is given once with the
+            rows of all of them.
 
     Note-summary_operator is always applied on metric column passed,
          and only when grouping is done
@@ -82,50 +94,72 @@ def time_compare(table, metric, all_dimensions, time_compare_column, date_range1
 
     dimensions = kwargs.get('dimensions', None)
 
-    result_tuple = _time_compare_results(table, metric, 
+    workers = kwargs.get('workers', 1)
+
+    date_ranges = [date_range1, date_range2]
+    if kwargs.get('date_ranges', None) is not None:
+        date_ranges = date_ranges + kwargs.get('date_ranges')
+
+    # the slices are applied & the date column is parsed once, the results
+    # and the oversights are computed on the rows of all the date ranges
+    labelled_table = _labelled_table(table, time_compare_column,
+                                     date_ranges, day_first,
+                                     slices = slices)
+
+    result_tuple = _time_compare_results(labelled_table, metric,
                                          time_compare_column,
-                                         date_range1, date_range2, 
-                                         day_first, summary_operator,
-                                         dimensions = dimensions, 
-                                         slices = slices)
+                                         summary_operator,
+                                         dimensions = dimensions)
 
     result_table = result_tuple[0]
 
     suggestions = result_tuple[1]
 
-    table_slice1 = aspects.apply_date_range(table, date_range1,
-                                            time_compare_column, 
-                                            day_first)
-    table_slice1[time_compare_column] = date_range1[0] + " - " + date_range1[1]
-    
-    table_slice2 = aspects.apply_date_range(table, date_range2,
-                                            time_compare_column, 
-                                            day_first)
-    table_slice2[time_compare_column] = date_range2[0] + " - " + date_range2[1]
-
-    oversights_detection_table = pandas.concat([table_slice2, table_slice1])
-    oversights_detection_table = oversights_detection_table.reset_index(drop = True)
-
-    simpsons_paradox_suggestion = simpsons_paradox(oversights_detection_table, 
+    # the grouped results used by both simpson's paradox & top-down error,
+    # computed once for all the date ranges
+    drill_down_results = drill_down.drill_down_results(labelled_table,
+                                                       metric, all_dimensions,
+                                                       time_compare_column,
+                                                       summary_operator,
+                                                       dimensions = dimensions,
+                                                       workers = workers)
+
+    for date_range_i in range(len(date_ranges) - 1):
+        slice1 = _date_range_label(date_ranges[date_range_i])
+        slice2 = _date_range_label(date_ranges[date_range_i + 1])
+
+        slices_drill_down_results = drill_down.keep_slices(drill_down_results,
+                                                           time_compare_column,
+                                                           [slice1, slice2])
+
+        simpsons_paradox_suggestion = simpsons_paradox(labelled_table,
+                                                       metric, all_dimensions,
+                                                       time_compare_column,
+                                                       slice1, slice2,
+                                                       summary_operator,
+                                                       dimensions = dimensions,
+                                                       drill_down_results = slices_drill_down_results)
+
+        top_down_error_suggestion = top_down_error(labelled_table,
                                                    metric, all_dimensions,
                                                    time_compare_column,
-                                                   date_range1[0] + " - " + date_range1[1],
-                                                   date_range2[0] + " - " + date_range2[1],
+                                                   slice1, slice2,
                                                    summary_operator,
                                                    dimensions = dimensions,
-                                                   slices = slices)
-
-    top_down_error_suggestion = top_down_error(oversights_detection_table,  
-                                               metric, all_dimensions,
-                                               time_compare_column,
-                                               str(date_range1[0] + " - " + date_range1[1]),
-                                               str(date_range2[0] + " - " + date_range2[1]),
-                                               summary_operator,
-                                               dimensions = dimensions,
-                                               slices = slices)
-
-    suggestions += simpsons_paradox_suggestion + top_down_error_suggestion
-    
+                                                   drill_down_results = slices_drill_down_results)
+
+        # rows of the suggestions are the rows of the results of the 2
+        # date ranges, they are changed to the rows in the result table
+        slices_result_index = slices_drill_down_results['result_table'].index
+        for suggestion in simpsons_paradox_suggestion + top_down_error_suggestion:
+            for row_suggestion in suggestion['row_list']:
+                row_suggestion['row'] = int(slices_result_index[row_suggestion['row'] - 1]) + 1
+            suggestions.append(suggestion)
+
+    # the same message found for different pairs of date ranges is given
+    # once, with the rows of all the pairs
+    suggestions = rank_oversights.merge_suggestions(suggestions)
+
     order = oversights_order.ORDER_IN_TIME_COMPARE
 
     suggestions = rank_oversights.rank_oversights(suggestions, order)
@@ -135,8 +169,60 @@ def time_compare(table, metric, all_dimensions, time_compare_column, date_range1
 
     return (result_table, suggestions)
 
-def _time_compare_results(table, metric, time_compare_column, 
-                          date_range1, date_range2, day_first, 
+def _labelled_table(table, time_compare_column, date_ranges, day_first,
+                    **kwargs):
+    """ This function returns the rows of all the date ranges, in which the
+    date is replaced by the label of the date range, '<start_date> - <end_date>'.
+    A row that lies in more than one date range appears once for each of them.
+    The date column is parsed only once, and the rows of each date range
+    are found by a mask on the parsed dates.
+
+    Args:
+        table: Type-pandas.dataframe
+            It has the contents of the csv file
+        time_compare_column: Type-string
+            the column name by which we will do comparision.
+        date_ranges: Type-list of tuples of start_date and end_date
+            the date ranges to be compared
+        day_first: Type-str
+            Day_first denotes that does day in the date occurs before month in the
+            dates in the date column
+            Example - '29-02-19', here day_first is true
+        slices: Type-List of tuples
+            Tuple represents the conditon to keep the row.
+            (column_name, filter, value)
+
+    Returns:
+        The labelled table, Type-pandas.dataframe
+        rows of the date ranges, from the last date range to the first
+    """
+    slices = kwargs.get('slices', None)
+
+    table = aspects.slice_table(table, slices)
+
+    row_dates = date_module.str_to_datetime_column(table[time_compare_column],
+                                                   day_first)
+
+    table_slices = []
+    labels = []
+    for date_range in reversed(date_ranges):
+        in_date_range = aspects.date_range_mask(row_dates, date_range)
+        table_slices.append(table[in_date_range])
+        labels.append(numpy.full(int(in_date_range.sum()),
+                                 _date_range_label(date_range), dtype=object))
+
+    labelled_table = pandas.concat(table_slices, ignore_index = True)
+    labelled_table[time_compare_column] = numpy.concatenate(labels)
+
+    return labelled_table
+
+def _date_range_label(date_range):
+    """ This function returns the label of the date range in the results,
+    '<start_date> - <end_date>'
+    """
+    return date_range[0] + " - " + date_range[1]
+
+def _time_compare_results(table, metric, time_compare_column,
                           summary_operator, **kwargs):
 
     """ This function returns the results according to the intent.
@@ -144,7 +230,8 @@ def _time_compare_results(table, metric, time_compare_column,
 
     Args:
         table: Type-pandas.dataframe
-            It has the contents of the csv file
+            The table returned by _labelled_table, with the date column
+            replaced by the label of the date range of the row
         metric: Type-string
             It is the name of the column according to which grouping will be done.
             summary operator is applied on metric. Metric could a column
@@ -153,22 +240,8 @@ def _time_compare_results(table, metric, time_compare_column,
             It is the name of column we want.
             'compare batsman A and B according to total_runs',
              dimension is 'batsman'. we group by dimensions.
-        slices: Type-List of tuples
-            Tuple represents the conditon to keep the row.
-            (column_name, filter, value)
-            column_name - is the value of the column that the
-            condition is applied upon.
-            filter - Filters enum members, ex. Filters.IN
         time_compare_column: Type-string
             the column name by which we will do comparision.
-        date_range1: Type-tuple of start_date and end_date
-            first date range for which we have to do comparision
-        date_range2: Type-tuple of start_date and end_date
-            second date range for which we have to do comparision
-        day_first: Type-str
-            Day_first denotes that does day in the date occurs before month in the
-            dates in the date column
-            Example - '29-02-19', here day_first is true
         summary_operator: Type-summary_operators enum members
             It denotes the summary operator, after grouping by dimensions.
             ex. SummaryOperators.MAX, SummaryOperators.SUM
@@ -182,37 +255,15 @@ def _time_compare_results(table, metric, time_compare_column,
         suggestions: Type - List of strings, List of suggestions.
     """
 
-    slices = kwargs.get('slices', None)
-
     dimensions = kwargs.get('dimensions', None)
 
-    table = aspects.slice_table(table, slices)
-
     required_columns = []
     if dimensions is not None:
         required_columns = dimensions.copy()
     required_columns.append(time_compare_column)
     required_columns.append(metric)
 
-    required_table = aspects.crop_other_columns(table, required_columns)
-    
-    # we shall have two list so that we can combine both the table and 
-    # after applying the groupby operation we can get the desired result.
-    table_slice1 = aspects.apply_date_range(required_table,  
-                                            date_range1,
-                                            time_compare_column,
-                                            day_first)
-    table_slice1[time_compare_column] = date_range1[0] + " - " + date_range1[1]
-
-    table_slice2 = aspects.apply_date_range(required_table,  
-                                            date_range2,
-                                            time_compare_column,
-                                            day_first)
-    table_slice2[time_compare_column] = date_range2[0] + " - " + date_range2[1]
-
-    # Pandas library to combine the tables.
-    updated_table = pandas.concat([table_slice2, table_slice1])
-    updated_table = updated_table.reset_index(drop = True)
+    updated_table = aspects.crop_other_columns(table, required_columns)
 
     grouping_columns = []
     if dimensions is not None:
@@ -226,4 +277,4 @@ def _time_compare_results(table, metric, time_compare_column,
 
     suggestions = after_group_by['suggestions']
 
-    return (result_table, suggestions)
\ No newline at end of file
+    return (result_table, suggestions)
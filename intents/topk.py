@@ -98,16 +98,26 @@ def topk(table, metric, dimensions, is_asc, k, **kwargs):
 
     summary_operator = kwargs.get('summary_operator', None)
 
-    result_tuple = topk_results(table, metric, dimensions, is_asc, k,
+    # slicing is the same for the given and the previous time window
+    # used by regression to the mean, so it is applied only once
+    table = aspects.slice_table(table, slices)
+
+    # the table is filtered, grouped and sorted only once, the top-k and
+    # the inputs of the oversights are derived from the full ranking
+    result_tuple = topk_results(table, metric, dimensions, is_asc, -1,
                                 date_column_name=date_column_name,
                                 date_range=date_range, day_first=day_first,
-                                slices=slices,
                                 summary_operator=summary_operator)
 
-    result_table = result_tuple[0]
+    results_without_k_condition = result_tuple[0]
 
     suggestions = result_tuple[1]
 
+    # copied as the metric column of result_table is renamed later
+    result_table = results_without_k_condition
+    if k != -1:
+        result_table = results_without_k_condition.head(k).copy()
+
     duplicates_in_topk_suggestion = duplicates_in_topk(result_table, dimensions)
 
     if duplicates_in_topk_suggestion is not None:
@@ -118,18 +128,13 @@ def topk(table, metric, dimensions, is_asc, k, **kwargs):
         rmt_suggestion = regression_to_mean(table, metric, dimensions, is_asc, k,
                                             date_column_name=date_column_name,
                                             date_range=date_range,
-                                            day_first=day_first, slices=slices,
-                                            summary_operator=summary_operator)
+                                            day_first=day_first,
+                                            summary_operator=summary_operator,
+                                            current_topk=result_table)
 
         if rmt_suggestion is not None:
             suggestions.append(rmt_suggestion)
 
-    results_without_k_condition = topk_results(table, metric, dimensions, is_asc, -1,
-                                               date_column_name=date_column_name,
-                                               date_range=date_range, day_first=day_first,
-                                               slices=slices,
-                                               summary_operator=summary_operator)[0]
-
     more_than_just_topk_suggestion = more_than_just_topk(results_without_k_condition, k, metric)
 
     if more_than_just_topk_suggestion is not None:
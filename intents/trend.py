@@ -24,8 +24,11 @@ Some of the operations are optional.
 """
 
 import datetime
+import numpy
+import pandas
 
-from util import aspects, date_module, oversights_order, rank_oversights
+from util import aspects, date_module, downsample, oversights_order, rank_oversights
+from util.enums import Smoothings
 
 def trend(table, metric, granularity, summary_operator, **kwargs):
     """This function will implement the trend intent
@@ -61,6 +64,29 @@ def trend(table, metric, granularity, summary_operator, **kwargs):
             It denotes the summary operator
         granularity: Type-granularities enum member
             It denotes the granularity we need to apply to the dates.
+        fill_value:
+            The value of the metric for the periods in between, in which
+            there is no row. Optional, if it is not passed the periods
+            without rows are not in the results.
+        smoothing: Type-list of Smoothings enum members
+            For every smoothing a column '<smoothing> of <metric>' is added
+            next to the metric column, ex. Smoothings.ROLLING_MEAN
+            Applied only if the summary operator is applied.
+        window: Type-int
+            Number of periods in the rolling window, the first periods
+            have only the periods before them in the window. Default 3.
+        dimensions: Type-list of str
+            The trend is split into one series for every value of the
+            dimensions, ex. one series for every city. Optional, if it is
+            not passed there is a single series.
+        pivot: Type-Bool
+            If True, the table has a row for every period & a column for
+            every series(wide), else a row for every period & series(long).
+            Default True, used only if dimensions are passed.
+        max_points: Type-int
+            Maximum number of periods kept in every series, the series
+            are downsampled keeping their shape. Optional, if it is not
+            passed all the periods are kept.
 
     Returns:
         The function will return both suggestions and the results in a tuple.
@@ -75,31 +101,71 @@ def trend(table, metric, granularity, summary_operator, **kwargs):
 
     slices = kwargs.get('slices', None)
 
+    fill_value = kwargs.get('fill_value', None)
+
+    smoothing = kwargs.get('smoothing', None)
+    window = kwargs.get('window', 3)
+
+    dimensions = kwargs.get('dimensions', None)
+    pivot = kwargs.get('pivot', True)
+
+    max_points = kwargs.get('max_points', None)
+
     table = aspects.apply_date_range(table, date_range,
                                      date_column_name, day_first)
 
     table = aspects.slice_table(table, slices)
 
+    # the date column & the dimensions form the series in one grouping
+    grouping_columns = [date_column_name]
+    if dimensions is not None:
+        grouping_columns = grouping_columns + dimensions
+
     # collecting the colums not to be removed
-    required_columns = [date_column_name, metric]
+    required_columns = grouping_columns.copy()
+    required_columns.append(metric)
 
     table = aspects.crop_other_columns(table, required_columns)
 
-    num_rows = table.shape[0]
-    for row in range(num_rows):
-        row_date = date_module.str_to_datetime(table.loc[row, date_column_name],
-                                               day_first)
-        row_date = aspects.granular_time(row_date, granularity)
-        table.loc[row, date_column_name] = row_date.strftime('%Y-%m-%d')
+    # the whole date column is parsed and floored to the granularity at once
+    row_dates = date_module.str_to_datetime_column(table[date_column_name],
+                                                   day_first)
+    row_dates = aspects.granular_time_column(row_dates, granularity)
+
+    period_format = '%Y-%m-%d'
+
+    # assign returns a new table, so the table passed is not modified
+    table = table.assign(**{date_column_name: row_dates.dt.strftime(period_format)})
 
-    after_group_by = aspects.group_by(table, [date_column_name], summary_operator)
+    after_group_by = aspects.group_by(table, grouping_columns, summary_operator)
 
     table = after_group_by['table']
 
-    table = table.sort_values(by=[date_column_name])
+    if summary_operator is None:
+        table = table.sort_values(by=[date_column_name])
+    else:
+        # every period from the first to the last date is added, the periods
+        # without any row get the fill_value
+        all_periods = None
+        if fill_value is not None and row_dates.notna().any():
+            all_periods = aspects.granular_time_range(row_dates.min(), row_dates.max(),
+                                                      granularity)
+            all_periods = all_periods.strftime(period_format).unique()
+
+        table = _series_table(table, metric, grouping_columns,
+                              after_group_by['suggestions'],
+                              all_periods=all_periods, fill_value=fill_value,
+                              pivot=pivot, smoothing=smoothing, window=window)
 
     suggestions = after_group_by['suggestions']
 
+    if max_points is not None:
+        (table, suggestions) = downsample_results(table, suggestions, metric, max_points,
+                                                  date_column_name=date_column_name,
+                                                  dimensions=dimensions, pivot=pivot,
+                                                  smoothing=smoothing,
+                                                  summary_operator=summary_operator)
+
     # add mean vs median suggestion
 
     order = oversights_order.ORDER_IN_TREND
@@ -107,3 +173,279 @@ def trend(table, metric, granularity, summary_operator, **kwargs):
     suggestions = rank_oversights.rank_oversights(suggestions, order)
 
     return (table, suggestions)
+
+def downsample_results(table, suggestions, metric, max_points, **kwargs):
+    """This function reduces the periods of every series in the results of
+    the trend to at most max_points, by the largest-triangle-three-buckets
+    method, so that the chart of the series keeps its shape.
+    In the wide table all the series share the rows, so at most max_points
+    rows are kept. In the long table the rows of every series are reduced
+    separately, so up to max_points rows are kept for each series.
+    The periods are placed by their time, so the gaps between them are
+    taken into account. The rows of the suggestions are updated to the
+    rows kept, the suggestions of the rows dropped are removed.
+
+    Args:
+        table: Type-pandas.dataframe
+            The results of the trend
+        suggestions: Type-list of dictionaries
+            The suggestions of the trend
+        metric: Type-string
+        max_points: Type-int
+            Maximum number of periods kept in every series, at least 3
+        date_column_name, dimensions, pivot, smoothing, summary_operator:
+            The same as passed to trend, they tell the layout of the table.
+
+    Returns:
+        The downsampled results and their suggestions in a tuple.
+        (results, suggestions)
+    """
+    date_column_name = kwargs.get('date_column_name', 'date')
+    dimensions = kwargs.get('dimensions', None)
+    pivot = kwargs.get('pivot', True)
+    smoothing = kwargs.get('smoothing', None)
+    summary_operator = kwargs.get('summary_operator', None)
+
+    if max_points < 3:
+        raise Exception('At least 3 points must be kept while downsampling')
+
+    num_rows = table.shape[0]
+
+    if num_rows <= max_points:
+        return (table, suggestions)
+
+    period_times = pandas.to_datetime(table[date_column_name]).values.astype('int64')
+    period_times = (period_times - period_times.min()) / 1e9
+
+    # the positions of the rows & the values of every series
+    series_list = []
+    if not dimensions:
+        series_list.append((numpy.arange(num_rows), table[metric].values))
+    elif pivot and summary_operator is not None:
+        # the series share the rows, so the same rows are kept for all of
+        # them, the series columns are followed by the smoothing columns
+        num_series = (table.shape[1] - 1) // (1 + len(smoothing or []))
+        series_columns = table.columns[1:1 + num_series]
+        series_list.append((numpy.arange(num_rows),
+                            table[series_columns].values.astype(float)))
+    else:
+        metric_values = table[metric].values
+        for positions in table.groupby(dimensions, sort=False, dropna=False).indices.values():
+            series_list.append((positions, metric_values[positions]))
+
+    kept_positions = []
+    for (positions, values) in series_list:
+        # the periods without a value are not charted
+        values = values.astype(float)
+        if values.ndim == 1:
+            present = ~numpy.isnan(values)
+            positions = positions[present]
+            values = values[present]
+        kept = downsample.largest_triangle_three_buckets(period_times[positions],
+                                                         values, max_points)
+        kept_positions.append(positions[kept])
+
+    kept_positions = numpy.unique(numpy.concatenate(kept_positions))
+
+    new_rows = numpy.full(num_rows, -1)
+    new_rows[kept_positions] = numpy.arange(len(kept_positions))
+
+    updated_suggestions = []
+    for suggestion in suggestions:
+        row_list = []
+        for row_suggestion in suggestion['row_list']:
+            new_row = new_rows[row_suggestion['row'] - 1]
+            if new_row >= 0:
+                row_suggestion['row'] = int(new_row) + 1
+                row_list.append(row_suggestion)
+        if len(row_list) > 0:
+            suggestion['row_list'] = row_list
+            updated_suggestions.append(suggestion)
+
+    table = table.iloc[kept_positions].reset_index(drop=True)
+
+    return (table, updated_suggestions)
+
+def _series_table(table, metric, grouping_columns, suggestions, **kwargs):
+    """This function lays out the grouped table as the series of the trend,
+    adds the periods without any row & the smoothing columns, and updates
+    the rows of the suggestions to the rows of the new table.
+
+    Every series is a column of the metric(wide), or the rows of the
+    series are kept one after the other for every period(long). Missing
+    cells of a series in the wide table get the fill_value if it is
+    passed, else they are NaN.
+
+    Args:
+        table: Type-pandas.dataframe
+            Table returned by group_by, the columns are the grouping_columns
+            & the metric, in this order.
+        metric: Type-string
+        grouping_columns: Type-list of str
+            The date column followed by the dimensions of the series.
+        suggestions: Type-list of dictionaries
+            Suggestions returned by group_by, the rows in their row_list
+            are updated in place. In the wide table a row_suggestion also
+            gets the key 'column', the column of the series of the cell.
+        all_periods: Type-list of str
+            Every period from the first to the last date, None if the
+            periods without rows are not added.
+        fill_value:
+            The value of the metric for the periods added.
+        pivot: Type-Bool
+        smoothing: Type-list of Smoothings enum members
+        window: Type-int
+
+    Returns:
+        The table of the trend, Type-pandas.dataframe
+    """
+    all_periods = kwargs.get('all_periods', None)
+    fill_value = kwargs.get('fill_value', None)
+    pivot = kwargs.get('pivot', True)
+    smoothing = kwargs.get('smoothing', None)
+    window = kwargs.get('window', 3)
+
+    date_column_name = grouping_columns[0]
+    dimensions = grouping_columns[1:]
+
+    values = table.set_index(grouping_columns)[metric]
+
+    # the group of every row of the grouped table, to trace the suggestions
+    group_keys = values.index
+
+    if len(dimensions) > 0 and (pivot or all_periods is not None):
+        values = values.unstack(level=list(range(1, len(grouping_columns))),
+                                fill_value=fill_value)
+
+    if all_periods is not None:
+        values = values.reindex(values.index.union(all_periods), fill_value=fill_value)
+
+    if len(dimensions) > 0 and pivot:
+        series_names = _series_names(values.columns)
+        values.columns = series_names
+
+        new_rows = values.index.get_indexer(group_keys.get_level_values(0))
+        new_columns = _series_names(group_keys.droplevel(0))
+
+        table = values.rename_axis(date_column_name).reset_index()
+
+        if smoothing is not None:
+            for smoothing_operator in smoothing:
+                for series_name in series_names:
+                    table['{} of {}'.format(smoothing_operator.name, series_name)] = \
+                        _smoothed_values(values[series_name].values,
+                                         smoothing_operator, window)
+
+        for suggestion in suggestions:
+            for row_suggestion in suggestion['row_list']:
+                group_position = row_suggestion['row'] - 1
+                row_suggestion['row'] = int(new_rows[group_position]) + 1
+                row_suggestion['column'] = new_columns[group_position]
+            suggestion['row_list'].sort(key=lambda row_suggestion: row_suggestion['row'])
+
+        return table
+
+    if len(dimensions) > 0 and all_periods is not None:
+        # back to a row for every period & series, in the order of the periods
+        index_arrays = [numpy.repeat(values.index.values, values.shape[1])]
+        for level in range(values.columns.nlevels):
+            index_arrays.append(numpy.tile(values.columns.get_level_values(level).values,
+                                           values.shape[0]))
+        values = pandas.Series(values.values.ravel(),
+                               index=pandas.MultiIndex.from_arrays(index_arrays,
+                                                                   names=grouping_columns),
+                               name=metric)
+
+    new_rows = values.index.get_indexer(group_keys)
+
+    table = values.rename_axis(grouping_columns).reset_index()
+
+    if smoothing is not None:
+        for smoothing_operator in smoothing:
+            smoothing_column = '{} of {}'.format(smoothing_operator.name, metric)
+            if len(dimensions) == 0:
+                table[smoothing_column] = _smoothed_values(values.values,
+                                                           smoothing_operator, window)
+                continue
+
+            # every series is smoothed separately, its rows are
+            # in the order of the periods
+            smoothed = numpy.full(len(values), numpy.nan)
+            series_positions = values.groupby(level=list(range(1, len(grouping_columns))),
+                                              sort=False).indices
+            for positions in series_positions.values():
+                smoothed[positions] = _smoothed_values(values.values[positions],
+                                                       smoothing_operator, window)
+            table[smoothing_column] = smoothed
+
+    for suggestion in suggestions:
+        for row_suggestion in suggestion['row_list']:
+            row_suggestion['row'] = int(new_rows[row_suggestion['row'] - 1]) + 1
+
+    return table
+
+def _series_names(series_keys):
+    """This function returns the names of the columns of the series in the
+    wide table, the values of the dimensions joined by ', ' if there are
+    more than one dimension.
+
+    Args:
+        series_keys: Type-pandas.Index or pandas.MultiIndex
+            The values of the dimensions of every series
+
+    Returns:
+        The names of the series, Type-pandas.Index of str
+    """
+    if isinstance(series_keys, pandas.MultiIndex):
+        return pandas.Index([', '.join(str(value) for value in series_key)
+                             for series_key in series_keys])
+    return pandas.Index([str(value) for value in series_keys])
+
+def _smoothed_values(values, smoothing_operator, window):
+    """This function applies the smoothing on the values of the trend, in
+    the order of the periods.
+    All the smoothings are computed from the cumulative sum of the values,
+    so each of them takes a single pass over the values whatever the window.
+    The values that are not present(NaN) are left out of the sums.
+    Only numeric values can be smoothed.
+
+    Args:
+        values: Type-numpy.ndarray
+            The metric of every period, in the order of the periods
+        smoothing_operator: Type-Smoothings enum member
+        window: Type-int
+            Number of periods in the rolling window
+
+    Returns:
+        The smoothed values, Type-numpy.ndarray
+    """
+    if window < 1:
+        raise Exception('Window of the smoothing must be at least 1 period')
+
+    # sums of integers are kept as integers
+    if numpy.issubdtype(values.dtype, numpy.integer):
+        present = numpy.ones(len(values), dtype=bool)
+    else:
+        values = values.astype(float)
+        present = ~numpy.isnan(values)
+        values = numpy.where(present, values, 0)
+
+    cumulative_sum = numpy.cumsum(values)
+
+    if smoothing_operator == Smoothings.CUMULATIVE_SUM:
+        return cumulative_sum
+
+    # sum of the window ending at each period = cumulative sum at the period
+    # - cumulative sum at the period just before the window
+    rolling_sum = cumulative_sum.copy()
+    rolling_sum[window:] -= cumulative_sum[:-window]
+
+    if smoothing_operator == Smoothings.ROLLING_SUM:
+        return rolling_sum
+
+    cumulative_count = numpy.cumsum(present)
+    rolling_count = cumulative_count.copy()
+    rolling_count[window:] -= cumulative_count[:-window]
+
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        return rolling_sum / rolling_count
@@ -22,17 +22,69 @@ Example in slicing - the rows that do not satisft the slicing condition
 are dropped.
 """
 from util import enums, date_module
-import datetime , statistics
-from oversights.mean_vs_median import mean_vs_median
-from oversights.attribution_with_hidden_negative import attribution_with_hidden_negative
+import datetime
+import numpy
+import pandas
+from oversights.mean_vs_median import mean_vs_median_of_groups
+from oversights.attribution_with_hidden_negative import attribution_with_hidden_negative_of_groups
+
+# pandas frequency of the dates floored to every granularity
+_GRANULARITY_FREQUENCIES = {enums.Granularities.HOURLY: 'H',
+                            enums.Granularities.DAILY: 'D',
+                            enums.Granularities.WEEKLY: 'W-MON',
+                            enums.Granularities.MONTHLY: 'MS',
+                            enums.Granularities.QUARTERLY: 'QS',
+                            enums.Granularities.ANNUALLY: 'AS'}
+
+class _GroupByContext:
+    """ This class holds the state of a single group_by call, that the
+    aggregations(_grouped_mean, _grouped_proportion) update while
+    giving oversights.
+    A new context is created in every group_by call, so concurrent
+    group_by calls(ex. in different threads) do not share any state.
+
+    Attributes:
+        group_row_index: Type-int
+            Row index of the groups in the result table
+        suggestions: Type-list of dictionaries
+            List of suggestions created by grouping , each suggestion
+            being a dictionary defined by the oversight
+    """
+
+    def __init__(self):
+        # defining the first row index as 1
+        self.group_row_index = 1
+
+        # starting with an empty list of suggestions
+        self.suggestions = []
 
-# Global Variables used by group_by and _mean to give oversights
+    def add_row_suggestion(self, suggestion):
+        """ Attributes the suggestion to the row at group_row_index.
+        The first suggestion is stored along with a new row_list, for the
+        later ones only the row is appended to that row_list.
 
-# Row index of the groups in the result table
-group_row_index = 1
+        Args:
+            suggestion: Type-dictionary
+                suggestion defined by the oversight, None if the
+                oversight is not detected
+        """
+        if suggestion is None:
+            return
 
-# List of suggestions created by grouping , each suggestion being a dictionary defined by the oversight
-suggestions = []
+        row_suggestion = {}
+        row_suggestion['row'] = self.group_row_index
+        row_suggestion['confidence_score'] = suggestion['confidence_score']
+
+        # First suggestion
+        if len(self.suggestions) == 0:
+            suggestion['row_list'] = []
+
+            suggestion['row_list'].append(row_suggestion)
+            self.suggestions.append(suggestion)
+
+        else:
+            #Updating the suggestion
+            self.suggestions[-1]['row_list'].append(row_suggestion)
 
 
 def apply_date_range(table, date_range, date_column_name, day_first, **kwargs):
@@ -59,25 +111,40 @@ def apply_date_range(table, date_range, date_column_name, day_first, **kwargs):
         return table
 
     reset_index = kwargs.get('reset_index', True)
-    
-    num_rows = table.shape[0]
-
-    for row in range(num_rows):
-        row_date = date_module.str_to_datetime(table.loc[row, date_column_name],
-                                               day_first)
 
-        # format of start_date & end_date strings is always fixed
-        start_date = datetime.datetime.strptime(date_range[0], '%Y-%m-%d')
-        end_date = datetime.datetime.strptime(date_range[1], '%Y-%m-%d')
+    # the date column is parsed once, and all the rows outside the
+    # date range are dropped together using a boolean mask
+    row_dates = date_module.str_to_datetime_column(table[date_column_name],
+                                                   day_first)
 
-        if row_date < start_date or end_date < row_date:
-            table = table.drop([row])
+    table = table[date_range_mask(row_dates, date_range)]
 
     # drop=True drops the new columnn named 'index' created in reset_index call
     if reset_index is True:
         table = table.reset_index(drop=True)
     return table
 
+def date_range_mask(row_dates, date_range):
+    """This function tells which of the dates lie in the date range
+       (contains start date and end date), so that the date column once
+       parsed can be checked against any number of date ranges.
+
+    Args:
+        row_dates: Type-pandas.Series
+            The parsed date column, of dtype datetime64
+        date_range: Type-tuple
+            Tuple of start_date and end_date
+            start_date & end_date are in a fixed format - '%Y-%m-%d'
+
+    Returns:
+        Boolean pandas.Series, True for the dates in the date range
+    """
+    # format of start_date & end_date strings is always fixed
+    start_date = datetime.datetime.strptime(date_range[0], '%Y-%m-%d')
+    end_date = datetime.datetime.strptime(date_range[1], '%Y-%m-%d')
+
+    return (row_dates >= start_date) & (row_dates <= end_date)
+
 def slice_table(table, slices,  **kwargs):
     """This function removes the rows from the table
        that do not satisfy the slicing condition.
@@ -114,45 +181,15 @@ def slice_table(table, slices,  **kwargs):
     if slices is None:
         return table
 
-    num_rows = table.shape[0]
-
-    # init a list that will contain index of rows to be dropped
-    rows_to_be_dropped = []
-
-    for row in range(num_rows):
-        slice_match = True
-        # checking if all condition in slices match
-        for condition in slices:
-            if condition[1] == enums.Filters.EQUAL_TO and not (
-                    table.loc[row, condition[0]] == condition[2]):
-                slice_match = False
-            if condition[1] == enums.Filters.NOT_EQUAL_TO and not (
-                    table.loc[row, condition[0]] != condition[2]):
-                slice_match = False
-            if condition[1] == enums.Filters.LESS_THAN and not (
-                    table.loc[row, condition[0]] < condition[2]):
-                slice_match = False
-            if condition[1] == enums.Filters.LESS_THAN_EQUAL_TO and not (
-                    table.loc[row, condition[0]] <= condition[2]):
-                slice_match = False
-            if condition[1] == enums.Filters.GREATER_THAN and not (
-                    table.loc[row, condition[0]] > condition[2]):
-                slice_match = False
-            if condition[1] == enums.Filters.GREATER_THAN_EQUAL_TO and not (
-                    table.loc[row, condition[0]] >= condition[2]):
-                slice_match = False
-            if condition[1] == enums.Filters.IN and not (
-                    table.loc[row, condition[0]] in condition[2]):
-                slice_match = False
-            if condition[1] == enums.Filters.NOT_IN and not (
-                    table.loc[row, condition[0]] not in condition[2]):
-                slice_match = False
-
-        # collecting row index if slice condition does not satisfy
-        if slice_match is not True:
-            rows_to_be_dropped.append(row)
-
-    table = table.drop(rows_to_be_dropped)
+    # the conditions are evaluated on whole columns at once, and a row is
+    # kept only if it satisfies all of them
+    slice_match = pandas.Series(True, index=table.index)
+
+    for condition in slices:
+        slice_match &= _condition_mask(table[condition[0]], condition[1],
+                                       condition[2])
+
+    table = table[slice_match]
 
     #some indices get deleted after slicing
     if reset_index is True:
@@ -160,6 +197,41 @@ def slice_table(table, slices,  **kwargs):
 
     return table
 
+def _condition_mask(column, condition_filter, value):
+    """This function evaluates one slicing condition on a whole column.
+
+    Args:
+        column: Type-pandas.Series
+            The column that the condition is applied upon
+        condition_filter: Type-Filters enum member
+            ex. enums.Filters.IN
+        value:
+            The value(list of values in case of IN & NOT_IN)
+            the column is compared with
+
+    Returns:
+        Boolean pandas.Series, True for the rows satisfying the condition
+    """
+    if condition_filter == enums.Filters.EQUAL_TO:
+        return column == value
+    if condition_filter == enums.Filters.NOT_EQUAL_TO:
+        return column != value
+    if condition_filter == enums.Filters.LESS_THAN:
+        return column < value
+    if condition_filter == enums.Filters.LESS_THAN_EQUAL_TO:
+        return column <= value
+    if condition_filter == enums.Filters.GREATER_THAN:
+        return column > value
+    if condition_filter == enums.Filters.GREATER_THAN_EQUAL_TO:
+        return column >= value
+    if condition_filter == enums.Filters.IN:
+        return column.isin(value)
+    if condition_filter == enums.Filters.NOT_IN:
+        return ~column.isin(value)
+
+    # a filter that is not supported does not drop any row
+    return pandas.Series(True, index=column.index)
+
 def crop_other_columns(table, required_columns):
     """This function removes the columns that are not in required_columns list
        This would help getting rid of columns that are not to be displayed.
@@ -179,170 +251,110 @@ def crop_other_columns(table, required_columns):
 
     return table
 
-def _count_distinct(values):
-    """ This function returns the number of distinct entries in values.
-    The values are inserted into a set and it's size is returned.
+def _grouped_mean(table, dimensions, context):
+    """ This function returns the average of every numeric column for
+    each group, along with it the function also tests the existence of
+    mean_vs_median oversight for every group.
 
     Args:
-        values: Type - anything that can be iterated over
-
-    Returns:
-        Count of distinct values.
-    """
-    distinct_set = set()
-    for value in values:
-        distinct_set.add(value)
-    return len(distinct_set)
-
-
-def _mean(values):
-    """ This function returns the average of values ,
-    along with it the function also tests the existence of
-    mean_vs_median oversight
-
-    Args:
-        values: Type - anything that can be iterated over
+        table: Type-pandas.dataframe
+        dimensions: Type-list
+            It contains the names of columns according to which we group
+        context: Type-_GroupByContext
+            state of the group_by call this aggregation belongs to
 
     Returns:
-        Average of values
+        The grouped table(grouping columns in the index) with the averages
 
-    Updates global variables,
-        group_row_index always increases by 1
-        suggestions is updated by the mean_vs_median suggestion if it exists    
+    Updates the context,
+        suggestions is updated by the mean_vs_median suggestions if they exist,
+        rows are numbered column after column, as the groups of every
+        column were aggregated one after the other
     """
+    grouped_table = table.groupby(dimensions).mean(numeric_only=True)
 
-    global group_row_index , suggestions
+    num_groups = grouped_table.shape[0]
 
-    mean = statistics.mean(values)
+    for column_i, column in enumerate(grouped_table.columns):
+        # average of integers is kept as an integer if it is a whole number
+        # for every group, like statistics.mean does
+        if pandas.api.types.is_integer_dtype(table[column]) and \
+           (grouped_table[column] % 1 == 0).all():
+            grouped_table[column] = grouped_table[column].astype(table[column].dtype)
 
-    # to collect all numbers in values
-    numbers = []
+        for group_position, suggestion in mean_vs_median_of_groups(table,
+                                                                    dimensions,
+                                                                    column):
+            context.group_row_index = column_i * num_groups + group_position + 1
+            context.add_row_suggestion(suggestion)
 
-    for value in values :
-        numbers.append(value)
+    context.group_row_index = len(grouped_table.columns) * num_groups + 1
 
-    suggestion = mean_vs_median(numbers)
-
-    if(suggestion is not None) :
-
-        row_suggestion = {}
-        row_suggestion['row'] = group_row_index
-        row_suggestion['confidence_score'] = suggestion['confidence_score']
-
-        # First mean_vs_median suggestion
-        if len(suggestions) == 0:
-            suggestion['row_list'] = []
-            
-            suggestion['row_list'].append(row_suggestion)
-            suggestions.append(suggestion)
-        
-        else:
-            #Updating the mean_vs_median suggestion
-            suggestions[-1]['row_list'].append(row_suggestion)
+    return grouped_table
 
-    group_row_index += 1
-
-    return mean
-
-def _sum_for_propotion(values):
-    """ This function returns the sum of values ,
-    it is called separately to be able to check the 
-    oversight of attribution with hidden negative
+def _grouped_proportion(table, dimensions, summary_operator, context):
+    """ This function returns the proportion of sum/count of every column
+    for each group, along with it the function also tests the existence
+    of attribution with hidden negative oversight for every group.
 
     Args:
-        values: Type - anything that can be iterated over
+        table: Type-pandas.dataframe
+        dimensions: Type-list
+            It contains the names of columns according to which we group
+        summary_operator: Type-SummaryOperators enum member
+            PROPORTION_OF_SUM or PROPORTION_OF_COUNT
+        context: Type-_GroupByContext
+            state of the group_by call this aggregation belongs to
 
     Returns:
-        sum of values
+        The grouped table(grouping columns in the index) with the proportions
 
-    Updates global variables,
-        group_row_index always increases by 1
-        suggestions is updated by the attribution with hidden negative suggestion if it exists    
+    Updates the context,
+        suggestions is updated by the attribution with hidden negative
+        suggestions if they exist, rows are numbered column after column,
+        as the groups of every column were aggregated one after the other
     """
+    grouped_table = _grouped_proportion_totals(table, dimensions,
+                                               summary_operator, context)
 
-    global group_row_index , suggestions
-
-    # to collect all numbers in values
-    numbers = []
-
-    sum_of_values = 0
-
-    for value in values :
-        sum_of_values += value
-        numbers.append(value)
-
-    suggestion = attribution_with_hidden_negative(numbers)
-
-    if(suggestion is not None) :
-
-        row_suggestion = {}
-        row_suggestion['row'] = group_row_index
-        row_suggestion['confidence_score'] = suggestion['confidence_score']
-
-        # First suggestion
-        if len(suggestions) == 0:
-            suggestion['row_list'] = []
-            
-            suggestion['row_list'].append(row_suggestion)
-            suggestions.append(suggestion)
-        
-        else:
-            #Updating the suggestion
-            suggestions[-1]['row_list'].append(row_suggestion)
-
-    group_row_index += 1
+    for column in grouped_table.columns:
+        grouped_table[column] /= grouped_table[column].sum()
 
-    return sum_of_values
+    return grouped_table
 
-def _count_for_propotion(values):
-    """ This function returns the count of values ,
-    it is called separately to be able to check the 
-    oversight of attribution with hidden negative
+def _grouped_proportion_totals(table, dimensions, summary_operator, context):
+    """ This function returns the sum/count of every column for each group,
+    i.e. the proportions before dividing by the total of the column, along
+    with the attribution with hidden negative suggestions.
 
     Args:
-        values: Type - anything that can be iterated over
+        table: Type-pandas.dataframe
+        dimensions: Type-list
+            It contains the names of columns according to which we group
+        summary_operator: Type-SummaryOperators enum member
+            PROPORTION_OF_SUM or PROPORTION_OF_COUNT
+        context: Type-_GroupByContext
+            state of the group_by call this aggregation belongs to
 
     Returns:
-        sum of values
-
-    Updates global variables,
-        group_row_index always increases by 1
-        suggestions is updated by the attribution with hidden negative suggestion if it exists    
+        The grouped table(grouping columns in the index) with the sums/counts
     """
+    if summary_operator == enums.SummaryOperators.PROPORTION_OF_SUM:
+        grouped_table = table.groupby(dimensions).sum(numeric_only=True)
+    else:
+        grouped_table = table.groupby(dimensions).count()
 
-    global group_row_index , suggestions
-
-    # to collect all numbers in values
-    numbers = []
-
-    count_of_values = 0
-
-    for value in values :
-        count_of_values += 1
-        numbers.append(value)
-
-    suggestion = attribution_with_hidden_negative(numbers)
-
-    if(suggestion is not None) :
-
-        row_suggestion = {}
-        row_suggestion['row'] = group_row_index
-        row_suggestion['confidence_score'] = suggestion['confidence_score']
+    num_groups = grouped_table.shape[0]
 
-        # First suggestion
-        if len(suggestions) == 0:
-            suggestion['row_list'] = []
-            
-            suggestion['row_list'].append(row_suggestion)
-            suggestions.append(suggestion)
-        
-        else:
-            #Updating the suggestion
-            suggestions[-1]['row_list'].append(row_suggestion)
+    for column_i, column in enumerate(grouped_table.columns):
+        for group_position, suggestion in \
+            attribution_with_hidden_negative_of_groups(table, dimensions, column):
+            context.group_row_index = column_i * num_groups + group_position + 1
+            context.add_row_suggestion(suggestion)
 
-    group_row_index += 1
+    context.group_row_index = len(grouped_table.columns) * num_groups + 1
 
-    return count_of_values
+    return grouped_table
 
 
 def group_by(table, dimensions, summary_operator, **kwargs):
@@ -364,18 +376,13 @@ def group_by(table, dimensions, summary_operator, **kwargs):
         'suggestions' -> List of suggestions structure i.e debiasing suggestion 
     """
 
-    global group_row_index , suggestions
-
     # Dictionary that will be returned
     result = {}
     result['table'] = table
     result['suggestions'] = []
 
-    # defining the first row index as 1
-    group_row_index = 1
-
-    # starting with an empty list of suggestions
-    suggestions = []
+    # state shared with the aggregation callbacks, local to this call
+    context = _GroupByContext()
 
     if summary_operator is None:
         return result
@@ -384,7 +391,7 @@ def group_by(table, dimensions, summary_operator, **kwargs):
         table = table.groupby(dimensions).sum()
 
     if summary_operator == enums.SummaryOperators.MEAN:
-        table = table.groupby(dimensions).agg(_mean)
+        table = _grouped_mean(table, dimensions, context)
 
     if summary_operator == enums.SummaryOperators.MEDIAN:
         table = table.groupby(dimensions).median()
@@ -411,32 +418,150 @@ def group_by(table, dimensions, summary_operator, **kwargs):
         table = table.groupby(dimensions).last()
 
     if summary_operator == enums.SummaryOperators.DISTINCT:
-        table = table.groupby(dimensions).agg(_count_distinct)
+        table = table.groupby(dimensions).nunique()
     
-    if summary_operator == enums.SummaryOperators.PROPORTION_OF_SUM:
-        table = table.groupby(dimensions).agg(_sum_for_propotion)
-        for column in table.columns:
-            if column not in dimensions:
-                table[column] /= table[column].sum()
-
-    if summary_operator == enums.SummaryOperators.PROPORTION_OF_COUNT:
-        table = table.groupby(dimensions).agg(_count_for_propotion)
-        for column in table.columns:
-            if column not in dimensions:
-                table[column] /= table[column].sum()
+    if summary_operator == enums.SummaryOperators.PROPORTION_OF_SUM or \
+       summary_operator == enums.SummaryOperators.PROPORTION_OF_COUNT:
+        table = _grouped_proportion(table, dimensions, summary_operator, context)
 
     table = table.reset_index()
 
     result['table'] = table
-    result['suggestions'] = suggestions
+    result['suggestions'] = context.suggestions
 
     return result
 
+def group_by_slice_and_all(table, dimensions, slice_compare_column,
+                           slice_value, all_label, summary_operator, **kwargs):
+    """Groups the rows of one slice and all the rows of the table by the
+    dimensions & the slice-compare column, the rows of the whole table
+    being labelled as all_label in the slice-compare column.
+    The result is the same as grouping the table with the rows of the slice
+    appended to a copy of the whole table relabelled as all_label, but the
+    table is neither copied nor concatenated, the whole table is grouped
+    by the dimensions only and the slice separately, and the 2 grouped
+    tables are then stitched in the order group_by would give.
+    When summary_operator is None the rows are not grouped, the rows of the
+    slice are followed by the rows of the whole table.
+
+    Args:
+        table: Type-pandas.dataframe
+        dimensions: Type-list of str
+            The dimensions to group by other than the slice-compare column,
+            can be empty
+        slice_compare_column: Type-str
+            name of the slice-compare column
+        slice_value:
+            the value of the slice-compare column for the slice
+        all_label: Type-str
+            the value of the slice-compare column for the whole table,
+            ex. 'ALL'
+        summary_operator: Type-SummaryOperators enum members
+            It denotes the summary operator
+        all_first: Type-bool
+            Only used when summary_operator is None, if True the rows of the
+            whole table come before the rows of the slice.
+            Default value - False
+
+    Returns:
+        Returns a dictionary with the following (key,values) :
+        'table' -> the table as a dataframe obj after applying grouping
+        'suggestions' -> List of suggestions structure i.e debiasing suggestion
+    """
+    grouping_columns = dimensions.copy()
+    grouping_columns.append(slice_compare_column)
+
+    table_for_slice = slice_table(table, [(slice_compare_column,
+                                           enums.Filters.EQUAL_TO, slice_value)])
+
+    # the columns of table_for_all are the columns of the table itself,
+    # only the slice-compare column is replaced by the label
+    all_columns = {}
+    for column in table.columns:
+        if column == slice_compare_column:
+            all_columns[column] = pandas.Series(all_label, index=table.index)
+        else:
+            all_columns[column] = table[column]
+    table_for_all = pandas.DataFrame(all_columns, copy=False)
+
+    if summary_operator is None:
+        if kwargs.get('all_first', False):
+            table = pandas.concat([table_for_all, table_for_slice])
+        else:
+            table = pandas.concat([table_for_slice, table_for_all])
+        return {'table': table.reset_index(drop=True), 'suggestions': []}
+
+    is_proportion = summary_operator == enums.SummaryOperators.PROPORTION_OF_SUM or \
+                    summary_operator == enums.SummaryOperators.PROPORTION_OF_COUNT
+
+    # the proportions are taken after stitching, with the totals of both
+    grouped_parts = []
+    for part in [table_for_all, table_for_slice]:
+        if is_proportion:
+            context = _GroupByContext()
+            grouped_table = _grouped_proportion_totals(part, grouping_columns,
+                                                       summary_operator, context)
+            grouped_parts.append({'table': grouped_table.reset_index(),
+                                  'suggestions': context.suggestions})
+        else:
+            grouped_parts.append(group_by(part, grouping_columns, summary_operator))
+
+    # an empty part is left out, so that it does not change the dtypes
+    nonempty_tables = [grouped_part['table'] for grouped_part in grouped_parts
+                       if grouped_part['table'].shape[0] > 0]
+    if len(nonempty_tables) == 0:
+        nonempty_tables = [grouped_parts[0]['table']]
+
+    stitched_table = pandas.concat(nonempty_tables).reset_index(drop=True)
+
+    # every row is a group of its own, so the group numbers are the
+    # positions of the rows in the sorted order of the groups
+    positions = stitched_table.groupby(grouping_columns, sort=True).ngroup().values
+
+    result_table = stitched_table.iloc[numpy.argsort(positions, kind='stable')]
+    result_table = result_table.reset_index(drop=True)
+
+    if is_proportion:
+        for column in result_table.columns[len(grouping_columns):]:
+            result_table[column] /= result_table[column].sum()
+
+    # the rows of the suggestions of both the parts are renumbered as the
+    # rows of the result, the rows of all of them are kept in increasing
+    # order in the suggestion having the first row, like group_by does
+    part_suggestions = []
+    part_start = 0
+    for grouped_part in grouped_parts:
+        num_groups = grouped_part['table'].shape[0]
+        part_positions = positions[part_start:part_start + num_groups]
+        part_start = part_start + num_groups
+
+        for suggestion in grouped_part['suggestions']:
+            for row_suggestion in suggestion['row_list']:
+                column_i, group_position = divmod(row_suggestion['row'] - 1, num_groups)
+                row_suggestion['row'] = column_i * result_table.shape[0] + \
+                                        int(part_positions[group_position]) + 1
+            part_suggestions.append(suggestion)
+
+    suggestions = []
+    if len(part_suggestions) > 0:
+        row_list = []
+        for suggestion in part_suggestions:
+            row_list = row_list + suggestion['row_list']
+
+        first_suggestion = min(part_suggestions,
+                               key=lambda suggestion: suggestion['row_list'][0]['row'])
+        first_suggestion['row_list'] = sorted(row_list,
+                                              key=lambda row_suggestion: row_suggestion['row'])
+        suggestions.append(first_suggestion)
+
+    return {'table': result_table, 'suggestions': suggestions}
+
 def granular_time(row_date, granularity):
     """ Sets the time such that all time thats difference
         is not > granularity have the same time.
-        It represents the hour, day, month, year that the date lies in,
-        in case of HOURLY, DAILY, MONTHLY, ANNUALLY respectively.
+        It represents the hour, day, week, month, quarter, year that the
+        date lies in, in case of HOURLY, DAILY, WEEKLY, MONTHLY, QUARTERLY,
+        ANNUALLY respectively, a week starts on monday.
         In other words it agregates dates,
         in some range to one date so that grouping can be done.
 
@@ -452,8 +577,9 @@ def granular_time(row_date, granularity):
         row_date: Type-datetime.datetime
         granularity: Type-Granularities enum member
             currently, only these are supported-
-            Granularities.HOURLY, Granularities.DAILY,
-            Granularities.monthly, Granularities.ANNUALLY
+            Granularities.HOURLY, Granularities.DAILY, Granularities.WEEKLY,
+            Granularities.monthly, Granularities.QUARTERLY,
+            Granularities.ANNUALLY
 
     Returns:
        Returns the updated row_date
@@ -466,9 +592,61 @@ def granular_time(row_date, granularity):
         row_date = row_date.replace(second=0, minute=0, hour=0, day=1)
     if granularity == enums.Granularities.ANNUALLY:
         row_date = row_date.replace(second=0, minute=0, hour=0, day=1, month=1)
+    if granularity == enums.Granularities.WEEKLY:
+        row_date = row_date.replace(second=0, minute=0, hour=0)
+        row_date = row_date - datetime.timedelta(days=row_date.weekday())
+    if granularity == enums.Granularities.QUARTERLY:
+        row_date = row_date.replace(second=0, minute=0, hour=0, day=1,
+                                    month=3 * ((row_date.month - 1) // 3) + 1)
 
     return row_date
 
+def granular_time_column(row_dates, granularity):
+    """ Sets the time of every date in the column, the same way as
+        granularity does for a single date, it floors the dates to
+        the hour, day, week, month, quarter, year they lie in.
+        All the dates are floored together, without converting them to
+        datetime objects one at a time.
+
+    Args:
+        row_dates: Type-pandas.Series
+            The parsed date column, of dtype datetime64
+        granularity: Type-Granularities enum member
+
+    Returns:
+       Returns the floored dates, Type-pandas.Series of dtype datetime64
+    """
+    if granularity == enums.Granularities.HOURLY:
+        row_dates = row_dates.dt.floor('H')
+    if granularity == enums.Granularities.DAILY:
+        row_dates = row_dates.dt.floor('D')
+    if granularity == enums.Granularities.WEEKLY:
+        row_dates = row_dates.dt.to_period('W-SUN').dt.to_timestamp()
+    if granularity == enums.Granularities.MONTHLY:
+        row_dates = row_dates.dt.to_period('M').dt.to_timestamp()
+    if granularity == enums.Granularities.QUARTERLY:
+        row_dates = row_dates.dt.to_period('Q').dt.to_timestamp()
+    if granularity == enums.Granularities.ANNUALLY:
+        row_dates = row_dates.dt.to_period('Y').dt.to_timestamp()
+
+    return row_dates
+
+def granular_time_range(start_date, end_date, granularity):
+    """ Returns all the dates from start_date to end_date, one for every
+        hour, day, week, month, quarter, year according to granularity,
+        floored the same way as granular_time_column floors them.
+
+    Args:
+        start_date, end_date: Type-pandas.Timestamp
+            floored to the granularity
+        granularity: Type-Granularities enum member
+
+    Returns:
+       Returns the dates, Type-pandas.DatetimeIndex
+    """
+    return pandas.date_range(start_date, end_date,
+                             freq=_GRANULARITY_FREQUENCIES[granularity])
+
 def update_metric_column_name(table, summary_operator, metric):
     """
     The function updates the name of the metric column to
@@ -0,0 +1,74 @@
+"""
+Copyright 2020 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+https://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+This module profiles the columns of a table, it finds out the kind of
+values each column holds using the dtype of the column, and for columns
+of mixed python objects the type inferred by pandas.
+The profile is computed once per table and can be used by every
+stage that needs to know the kind of a column.
+"""
+
+import pandas
+
+# types inferred by pandas.api.types.infer_dtype for which the column
+# cannot contain any string
+_NON_STRING_INFERRED_TYPES = {'empty', 'integer', 'floating', 'mixed-integer-float',
+                              'decimal', 'complex', 'boolean', 'datetime64',
+                              'datetime', 'date', 'timedelta64', 'timedelta',
+                              'time', 'period', 'interval', 'bytes'}
+
+def profile_columns(table):
+    """
+    This function returns the profile of all the columns in the table.
+
+    Numeric, boolean and datetime columns are profiled using only their
+    dtype. For the object columns the type of the values is inferred by
+    pandas in one pass over the column, only if the values are of mixed
+    types each value is checked.
+
+    Args:
+        table: Type-pandas.dataframe
+            The table whose columns are to be profiled
+    Returns:
+        List of dictionaries, one for each column in the order of the
+        columns of the table. Each dictionary has the keys -
+        'column' - name of the column
+        'inferred_type' - the type inferred by pandas, ex. 'integer', 'string'
+        'has_strings' - True if any of the values is a string
+    """
+    profile = []
+    for position in range(table.shape[1]):
+        column = table.iloc[:, position]
+
+        if isinstance(column.dtype, pandas.CategoricalDtype):
+            values = pandas.Series(column.cat.categories)
+        else:
+            values = column
+
+        inferred_type = pandas.api.types.infer_dtype(values, skipna=True)
+
+        if inferred_type == 'string':
+            has_strings = True
+        elif inferred_type in _NON_STRING_INFERRED_TYPES:
+            has_strings = False
+        else:
+            has_strings = bool(values.map(type).eq(str).any())
+
+        profile.append({'column': table.columns[position],
+                        'inferred_type': inferred_type,
+                        'has_strings': has_strings})
+
+    return profile
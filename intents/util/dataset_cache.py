@@ -0,0 +1,123 @@
+"""
+Copyright 2020 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+https://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+This module keeps the datasets registered by the UI in memory, so that
+the intents can be queried on a dataset without resending & reparsing
+the whole table each time.
+A dataset is stored against a handle, which is the hash of the contents
+of the table, so registering the same table again returns the same handle.
+When the memory used by the stored tables exceeds the limit, the least
+recently used datasets are evicted.
+"""
+
+import collections
+import hashlib
+import json
+import threading
+
+# memory limit in bytes of the tables stored in the cache
+DATASET_CACHE_MEMORY_LIMIT = 512 * 1024 * 1024
+
+_lock = threading.Lock()
+
+# handle -> dataset, ordered from least to most recently used
+_datasets = collections.OrderedDict()
+
+_memory_used = 0
+
+def dataset_handle(table):
+    """
+    This function returns the handle of the table, i.e. the sha256 hash
+    of the contents of the table as sent by the UI.
+
+    Args:
+        table: Type-list of lists or dictionary
+            The table as passed in the request json
+    Returns:
+        The handle, Type-str
+    """
+    table_json = json.dumps(table, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(table_json.encode('utf-8')).hexdigest()
+
+def put(handle, table, **kwargs):
+    """
+    This function stores the parsed table and the information computed from
+    it against the handle, then evicts the least recently used datasets
+    while the memory limit is exceeded.
+    The dataset just stored is never evicted.
+
+    Args:
+        handle: Type-str
+            handle returned by dataset_handle
+        table: Type-pandas.dataframe
+            The parsed table
+        table_header: Type-list of str
+            Column headers as in the sheet
+        column_profile: Type-list of dictionaries
+            Profile of the columns as returned by
+            column_profile.profile_columns
+        date_columns: Type-dictionary
+            The date columns detected by the UI, as passed in the request json
+    """
+    dataset = {'table': table,
+               'table_header': kwargs.get('table_header', None),
+               'column_profile': kwargs.get('column_profile', None),
+               'date_columns': kwargs.get('date_columns', None),
+               'memory': int(table.memory_usage(index=True, deep=True).sum())}
+
+    global _memory_used
+    with _lock:
+        if handle in _datasets:
+            _memory_used -= _datasets.pop(handle)['memory']
+
+        _datasets[handle] = dataset
+        _memory_used += dataset['memory']
+
+        while _memory_used > DATASET_CACHE_MEMORY_LIMIT and len(_datasets) > 1:
+            evicted_dataset = _datasets.popitem(last=False)[1]
+            _memory_used -= evicted_dataset['memory']
+
+def get(handle):
+    """
+    This function returns the dataset stored against the handle, and marks
+    it as the most recently used.
+    The table in the dataset is a copy, so the intents can modify it.
+
+    Args:
+        handle: Type-str
+    Returns:
+        Dictionary with keys 'table', 'table_header', 'column_profile',
+        'date_columns', or None if the handle is not present in the cache
+        (never registered or evicted).
+    """
+    with _lock:
+        if handle not in _datasets:
+            return None
+        _datasets.move_to_end(handle)
+        dataset = _datasets[handle]
+
+    dataset = dict(dataset)
+    dataset['table'] = dataset['table'].copy()
+    return dataset
+
+def clear():
+    """
+    This function removes all the datasets from the cache.
+    """
+    global _memory_used
+    with _lock:
+        _datasets.clear()
+        _memory_used = 0
@@ -41,3 +41,17 @@ def str_to_datetime(date, day_first):
     date_datetime = datetime.datetime.strptime(date_timestamp,
                                                '%Y-%m-%d %H:%M:%S')
     return date_datetime
+
+def str_to_datetime_column(dates, day_first):
+    """
+    Parses a whole column of date strings in one call, instead of calling
+    str_to_datetime on every cell.
+    Args :
+        dates - Type-pandas.Series
+            column containing the strings representing dates
+        day_first - Bool/None
+            Argument required to parse ambiguous dates.
+    Returns :
+        dates as a pandas.Series of dtype datetime64
+    """
+    return pandas.to_datetime(dates, dayfirst=day_first)
@@ -0,0 +1,100 @@
+"""
+Copyright 2020 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+https://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+This module reduces the number of points of a series to be charted,
+while keeping the shape of the series.
+It uses the largest-triangle-three-buckets method - the points are split
+into buckets, and from every bucket the point that forms the largest
+triangle with the point picked from the previous bucket and the average
+of the next bucket is kept, so the peaks & dips of the series are kept.
+"""
+
+import numpy
+
+def largest_triangle_three_buckets(x, y, max_points):
+    """
+    This function returns the positions of the points kept in the series.
+    The first and the last points are always kept.
+
+    Args:
+        x: Type-numpy.ndarray of numbers
+            The x coordinate of every point, in increasing order,
+            ex. the time of every period
+        y: Type-numpy.ndarray of numbers
+            The y coordinate of every point, ex. the metric of every period.
+            It can have a column for each of many series sharing the x
+            coordinates, then the same points are kept for all of them,
+            picked by the sum of the areas of the triangles of the series.
+            The values missing(NaN) in a series add no area.
+        max_points: Type-int
+            Maximum number of points kept, at least 3
+    Returns:
+        The positions of the points kept in increasing order,
+        Type-numpy.ndarray of int
+    """
+    if max_points < 3:
+        raise Exception('At least 3 points must be kept while downsampling')
+
+    num_points = len(x)
+
+    if num_points <= max_points:
+        return numpy.arange(num_points)
+
+    x = numpy.asarray(x, dtype=float)
+    y = numpy.asarray(y, dtype=float)
+    if y.ndim == 1:
+        y = y[:, numpy.newaxis]
+
+    # every series is scaled to its range, so that each of them
+    # counts the same in the sum of the areas
+    y_range = numpy.fmax.reduce(y, axis=0) - numpy.fmin.reduce(y, axis=0)
+    y_range[~(y_range > 0)] = 1
+    y = y / y_range
+    present = ~numpy.isnan(y)
+
+    # the first & the last points are buckets of their own,
+    # the points in between are split into max_points - 2 buckets
+    bucket_size = (num_points - 2) / (max_points - 2)
+    bucket_starts = (numpy.arange(max_points - 1) * bucket_size).astype(int) + 1
+    bucket_starts[-1] = num_points - 1
+
+    kept = numpy.empty(max_points, dtype=int)
+    kept[0] = 0
+    kept[-1] = num_points - 1
+
+    previous = 0
+    for bucket in range(max_points - 2):
+        start = bucket_starts[bucket]
+        end = bucket_starts[bucket + 1]
+
+        # the third corner of the triangles is the average of the next bucket
+        next_end = num_points
+        if bucket + 2 < len(bucket_starts):
+            next_end = bucket_starts[bucket + 2]
+        next_x = x[end:next_end].mean()
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            next_y = numpy.where(present[end:next_end], y[end:next_end], 0).sum(axis=0) / \
+                     present[end:next_end].sum(axis=0)
+
+        # twice the areas of the triangles formed by every point of the bucket
+        areas = numpy.abs((x[previous] - next_x) * (y[start:end] - y[previous]) -
+                          (x[previous] - x[start:end, numpy.newaxis]) * (next_y - y[previous]))
+        areas = numpy.nansum(areas, axis=1)
+
+        previous = start + int(numpy.argmax(areas))
+        kept[bucket + 1] = previous
+
+    return kept
@@ -45,12 +45,25 @@ class Granularities(enum.Enum):
     .ANNUALY , etc. are enum members
 
     The granularities are listed in an arbitrary order.
-    And currently annually, monthly, daily, hourly are used.
+    And currently annually, quarterly, monthly, weekly, daily, hourly are used.
     """
     ANNUALLY = 1
     MONTHLY = 2
     DAILY = 3
     HOURLY = 4
+    WEEKLY = 5
+    QUARTERLY = 6
+
+class Smoothings(enum.Enum):
+    """The attributes of this class like smoothings.ROLLING_MEAN ,
+    .CUMULATIVE_SUM , etc. are enum members
+
+    They denote the smoothings that can be applied on the trend.
+    And currently rolling mean, rolling sum, cumulative sum are used.
+    """
+    ROLLING_MEAN = 1
+    ROLLING_SUM = 2
+    CUMULATIVE_SUM = 3
 
 class Filters(enum.Enum):
     """The attributes of this class like Filters.EQUALTO ,
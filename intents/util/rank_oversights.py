@@ -14,7 +14,8 @@ limitations under the License.
 """
 """
 This module contains the function to rank oversights according to
-the order passed.
+the order passed, and the function to merge the row-level suggestions
+that give the same message.
 
 The suggestions will be displayed in the same order in the UI.
 """
@@ -47,3 +48,47 @@ def rank_oversights(suggestions, order):
     assert(len(suggestions) == len(sorted_suggestions))
 
     return sorted_suggestions
+
+def merge_suggestions(suggestions):
+    """
+    This function merges the row-level suggestions of the same oversight
+    with the same message into one suggestion, ex. the ones found for
+    different pairs of the compared slices. The row_list of the merged
+    suggestion has the rows of all of them, each row once, in increasing
+    order of the rows.
+
+    Args:
+        suggestions : list of dicts
+            Each dict represents one oversight's suggestion
+            Also, each dict should have the keys 'oversight' & 'suggestion'
+
+    Returns:
+        suggestions : list of dicts
+            In the order of the first suggestion of every message
+    """
+    merged_suggestions = []
+
+    # the suggestion kept for every (oversight, message)
+    kept_suggestions = {}
+
+    for suggestion in suggestions:
+        if 'row_list' not in suggestion:
+            merged_suggestions.append(suggestion)
+            continue
+
+        key = (suggestion['oversight'], suggestion['suggestion'])
+        if key not in kept_suggestions:
+            kept_suggestions[key] = suggestion
+            merged_suggestions.append(suggestion)
+            continue
+
+        kept_suggestion = kept_suggestions[key]
+        kept_rows = set(row['row'] for row in kept_suggestion['row_list'])
+        for row_suggestion in suggestion['row_list']:
+            if row_suggestion['row'] not in kept_rows:
+                kept_rows.add(row_suggestion['row'])
+                kept_suggestion['row_list'].append(row_suggestion)
+
+        kept_suggestion['row_list'].sort(key=lambda row_suggestion: row_suggestion['row'])
+
+    return merged_suggestions
@@ -0,0 +1,135 @@
+"""
+Copyright 2020 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+https://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+This module caches the responses of the intents, so that the same query
+on the same table is not computed again, ex. when the sidebar is reopened.
+The key of a response is built from the parameters of the query and the
+fingerprint of the table.
+The number of cached responses is limited, the least recently used are
+evicted first, and a response expires after a fixed time.
+"""
+
+import collections
+import hashlib
+import json
+import threading
+import time
+
+# maximum number of responses stored in the cache
+RESULT_CACHE_MAX_ENTRIES = 256
+
+# time in seconds after which a cached response expires
+RESULT_CACHE_TTL = 600
+
+# keys of the request json that hold the table, the fingerprint
+# of the table is used in the key instead of them
+_TABLE_KEYS = ['table', 'datasetHandle']
+
+_lock = threading.Lock()
+
+# key -> (time of insertion, response), ordered from least to most recently used
+_responses = collections.OrderedDict()
+
+_hits = 0
+_misses = 0
+
+def request_key(request_json, table_fingerprint):
+    """
+    This function returns the key of the query in the cache.
+    The parameters of the query are serialized with sorted keys, so the
+    order in which the UI sends them does not matter.
+
+    Args:
+        request_json: Type-dictionary
+            The request json, the table in it is ignored
+        table_fingerprint: Type-str
+            Fingerprint of the table queried, ex. the dataset handle
+    Returns:
+        The key, Type-str
+    """
+    parameters = {}
+    for key in request_json.keys():
+        if key not in _TABLE_KEYS:
+            parameters[key] = request_json[key]
+
+    parameters_json = json.dumps(parameters, sort_keys=True, separators=(',', ':'))
+
+    key_hash = hashlib.sha256(table_fingerprint.encode('utf-8'))
+    key_hash.update(parameters_json.encode('utf-8'))
+
+    return key_hash.hexdigest()
+
+def get(key):
+    """
+    This function returns the response cached for the key, or None if it
+    is not present or has expired.
+
+    Args:
+        key: Type-str
+            key returned by request_key
+    Returns:
+        The cached response, or None
+    """
+    global _hits, _misses
+    with _lock:
+        if key in _responses:
+            (insertion_time, response) = _responses[key]
+            if time.monotonic() - insertion_time <= RESULT_CACHE_TTL:
+                _responses.move_to_end(key)
+                _hits += 1
+                return response
+            del _responses[key]
+        _misses += 1
+        return None
+
+def put(key, response):
+    """
+    This function stores the response against the key, then evicts the
+    least recently used responses while there are too many of them.
+
+    Args:
+        key: Type-str
+            key returned by request_key
+        response: Type-str
+            The response json returned to the UI
+    """
+    with _lock:
+        _responses[key] = (time.monotonic(), response)
+        _responses.move_to_end(key)
+        while len(_responses) > RESULT_CACHE_MAX_ENTRIES:
+            _responses.popitem(last=False)
+
+def stats():
+    """
+    This function returns the counters of the cache.
+
+    Returns:
+        Dictionary with keys 'hits', 'misses' and 'size'(number of
+        responses stored)
+    """
+    with _lock:
+        return {'hits': _hits, 'misses': _misses, 'size': len(_responses)}
+
+def clear():
+    """
+    This function removes all the responses from the cache and
+    resets the counters.
+    """
+    global _hits, _misses
+    with _lock:
+        _responses.clear()
+        _hits = 0
+        _misses = 0
@@ -23,6 +23,7 @@ sys.path.append(".")
 
 import pandas
 import time
+import concurrent.futures
 import randstr, random
 from util import aspects, enums
 
@@ -240,9 +241,60 @@ def test_6():
     assert(expected_result_table == result_table.to_string())
     assert(str(result_suggestions) == expected_suggestions)
 
+def test_7():
+    """ Test for the date range aspect
+    Rows of the ratings dataset from 25th Jan 2010 to 25th March 2010,
+    the dates in the dataset have the day before the month.
+    Args:
+    Returns:
+    """
+    table = pandas.read_csv('data/rating.csv')
+
+    result_table = aspects.apply_date_range(table, ('2010-01-25', '2010-03-25'),
+                                            'date', True)
+
+    print(result_table)
+
+    expected_result_table = """         date User Name  Rating
+0  25/01/2010   tourist    3100
+1  25/02/2010       cba    3200
+2  25/03/2010     300iq    3300"""
+
+    assert(expected_result_table == result_table.to_string())
+
+def test_8():
+    """ Test for group_by being called concurrently
+    The same groupings are computed sequentially and in a thread pool,
+    both should give the same tables and suggestions.
+    Args:
+    Returns:
+    """
+    table_1 = pandas.read_csv('data/student_score_updated_to_have_negative_marks.csv')
+    table_2 = pandas.read_csv('data/data_for_test_aspects/student_performance.csv')
+
+    queries = [(table_1, ['student_name'], enums.SummaryOperators.PROPORTION_OF_SUM),
+               (table_2, ['race/ethnicity'], enums.SummaryOperators.MEAN)] * 10
+
+    def run_query(query):
+        result = aspects.group_by(query[0], query[1], query[2])
+        return (result['table'].to_string(), str(result['suggestions']))
+
+    sequential_results = [run_query(query) for query in queries]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        concurrent_results = list(executor.map(run_query, queries))
+
+    assert(sequential_results == concurrent_results)
+
 # print(generate_1.__doc__)
 # generate_1()
 
+print(test_7.__doc__)
+test_7()
+
+print(test_8.__doc__)
+test_8()
+
 print(test_1.__doc__)
 test_1()
 
@@ -0,0 +1,70 @@
+"""
+Copyright 2020 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+https://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""
+This module contains tests for column_profile.py
+"""
+import sys
+sys.path.append(".")
+
+import pandas
+from util import column_profile
+
+def test_1():
+    """
+    Profiles the columns of matches.csv, read using pandas.
+    The columns containing names are detected to contain strings,
+    the numeric columns are not.
+    """
+    table = pandas.read_csv('data/matches.csv')
+
+    profile = column_profile.profile_columns(table)
+
+    has_strings = {}
+    for column in profile:
+        has_strings[column['column']] = column['has_strings']
+
+    print(has_strings)
+
+    assert(has_strings['city'] == True)
+    assert(has_strings['winner'] == True)
+    assert(has_strings['season'] == False)
+    assert(has_strings['win_by_runs'] == False)
+    assert(has_strings['umpire3'] == False)
+
+def test_2():
+    """
+    Profiles a table of mixed python objects, as received from the sheets.
+    A single string in a column of numbers makes it contain strings.
+    """
+    table = pandas.DataFrame({'mixed' : [1, 'A', 2.5],
+                              'numbers' : [1, None, 2.5],
+                              'empty_cell' : ['', 1, 2],
+                              'flags' : [True, False, True]})
+
+    profile = column_profile.profile_columns(table)
+
+    print(profile)
+
+    expected_has_strings = [True, False, True, False]
+
+    assert([column['has_strings'] for column in profile] == expected_has_strings)
+
+print(test_1.__doc__)
+test_1()
+
+print(test_2.__doc__)
+test_2()
+
+print('Test cases completed')
@@ -0,0 +1,86 @@
+"""
+Copyright 2020 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+https://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""
+This module contains tests for dataset_cache.py
+"""
+import sys
+sys.path.append(".")
+
+import pandas
+from util import dataset_cache
+
+def test_1():
+    """
+    Registers a table & reads it back using its handle.
+    The same contents give the same handle, and the table returned
+    is a copy, so modifying it does not change the cached table.
+    """
+    dataset_cache.clear()
+
+    table = [['name', 'runs'], ['A', 10], ['B', 20]]
+    table_dataframe = pandas.DataFrame(table[1:], columns=table[0])
+
+    handle = dataset_cache.dataset_handle(table)
+    dataset_cache.put(handle, table_dataframe, table_header=table[0])
+
+    print(handle)
+
+    assert(handle == dataset_cache.dataset_handle([['name', 'runs'], ['A', 10], ['B', 20]]))
+    assert(handle != dataset_cache.dataset_handle([['name', 'runs'], ['A', 10], ['B', 21]]))
+
+    dataset = dataset_cache.get(handle)
+    dataset['table'].loc[0, 'runs'] = 100
+
+    assert(dataset['table_header'] == ['name', 'runs'])
+    assert(dataset_cache.get(handle)['table'].equals(table_dataframe))
+    assert(dataset_cache.get('not registered') is None)
+
+def test_2():
+    """
+    The memory limit allows only 2 of the tables to be cached.
+    The least recently used table is evicted on registering the third.
+    """
+    dataset_cache.clear()
+
+    tables = []
+    for i in range(3):
+        tables.append(pandas.DataFrame({'value' : range(i * 1000, (i + 1) * 1000)}))
+
+    table_memory = tables[0].memory_usage(index=True, deep=True).sum()
+
+    default_limit = dataset_cache.DATASET_CACHE_MEMORY_LIMIT
+    dataset_cache.DATASET_CACHE_MEMORY_LIMIT = 2 * table_memory
+
+    dataset_cache.put('handle0', tables[0])
+    dataset_cache.put('handle1', tables[1])
+
+    # handle0 becomes the most recently used
+    dataset_cache.get('handle0')
+
+    dataset_cache.put('handle2', tables[2])
+
+    dataset_cache.DATASET_CACHE_MEMORY_LIMIT = default_limit
+
+    assert(dataset_cache.get('handle0') is not None)
+    assert(dataset_cache.get('handle1') is None)
+    assert(dataset_cache.get('handle2') is not None)
+
+print(test_1.__doc__)
+test_1()
+
+print(test_2.__doc__)
+test_2()
+
+print('Test cases completed')
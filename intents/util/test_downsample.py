@@ -0,0 +1,80 @@
+"""
+Copyright 2020 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+https://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""
+This module contains tests for downsample.py
+"""
+import sys
+sys.path.append(".")
+
+import numpy
+from util import downsample
+
+def test_1():
+    """
+    Downsamples a series with a single spike to 5 points.
+    The first & the last points and the spike are kept.
+    """
+    x = numpy.arange(20)
+    y = numpy.zeros(20)
+    y[7] = 10
+
+    kept = downsample.largest_triangle_three_buckets(x, y, 5)
+
+    print(kept)
+
+    assert(len(kept) == 5)
+    assert(kept[0] == 0 and kept[-1] == 19)
+    assert(7 in kept)
+
+def test_2():
+    """
+    A series with no more points than max_points is kept as it is.
+    """
+    x = numpy.arange(4)
+    y = numpy.array([1, 3, 2, 5])
+
+    kept = downsample.largest_triangle_three_buckets(x, y, 4)
+
+    print(kept)
+
+    assert(list(kept) == [0, 1, 2, 3])
+
+def test_3():
+    """
+    Downsamples 2 series sharing the x coordinates to 4 points.
+    The spikes of both the series are kept, although the second
+    spike is much larger than the first.
+    """
+    x = numpy.arange(7)
+    y = numpy.zeros((7, 2))
+    y[1, 0] = 5
+    y[4, 1] = 100
+
+    kept = downsample.largest_triangle_three_buckets(x, y, 4)
+
+    print(kept)
+
+    assert(list(kept) == [0, 1, 4, 6])
+
+print(test_1.__doc__)
+test_1()
+
+print(test_2.__doc__)
+test_2()
+
+print(test_3.__doc__)
+test_3()
+
+print('Test cases completed')
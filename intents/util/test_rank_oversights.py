@@ -83,6 +83,37 @@ def test_3():
 
     assert(expected_ranked_suggestions == ranked_suggestions)
 
+def test_4():
+    """
+    The list of suggestions for slice-compare intent of 3 slices.
+    The suggestions with the same message of the same oversight are merged,
+    a row found in more than one of them is kept once.
+    """
+    suggestion1 = {'suggestion' : 'add city', 'oversight' : enums.Oversights.TOP_DOWN_ERROR,
+                   'row_list' : [{'row' : 3, 'confidence_score' : 100},
+                                 {'row' : 4, 'confidence_score' : 100}]}
+    suggestion2 = {'suggestion' : 'add city', 'oversight' : enums.Oversights.SIMPSONS_PARADOX,
+                   'row_list' : [{'row' : 3, 'confidence_score' : 100}]}
+    suggestion3 = {'suggestion' : 'add city', 'oversight' : enums.Oversights.TOP_DOWN_ERROR,
+                   'row_list' : [{'row' : 1, 'confidence_score' : 100},
+                                 {'row' : 3, 'confidence_score' : 100}]}
+    suggestion4 = {'suggestion' : 'add venue', 'oversight' : enums.Oversights.TOP_DOWN_ERROR,
+                   'row_list' : [{'row' : 2, 'confidence_score' : 100}]}
+
+    suggestions = [suggestion1, suggestion2, suggestion3, suggestion4]
+
+    merged_suggestions = rank_oversights.merge_suggestions(suggestions)
+
+    print(merged_suggestions)
+
+    expected_merged_suggestions = [{'suggestion' : 'add city',
+                                    'oversight' : enums.Oversights.TOP_DOWN_ERROR,
+                                    'row_list' : [{'row' : 1, 'confidence_score' : 100},
+                                                  {'row' : 3, 'confidence_score' : 100},
+                                                  {'row' : 4, 'confidence_score' : 100}]},
+                                   suggestion2, suggestion4]
+
+    assert(expected_merged_suggestions == merged_suggestions)
 
 
 print(test_1.__doc__)
@@ -94,4 +125,7 @@ test_2()
 print(test_3.__doc__)
 test_3()
 
+print(test_4.__doc__)
+test_4()
+
 print('Test cases completed')
@@ -0,0 +1,87 @@
+"""
+Copyright 2020 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+https://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""
+This module contains tests for result_cache.py
+"""
+import sys
+sys.path.append(".")
+
+from util import result_cache
+
+def test_1():
+    """
+    The key does not depend on the order of the parameters or on the
+    table passed, only on the fingerprint of the table.
+    The counters count the hits & misses.
+    """
+    result_cache.clear()
+
+    request1 = {'intent' : 'topk', 'metric' : 'runs', 'topKLimit' : 5,
+                'table' : [['name', 'runs'], ['A', 10]]}
+    request2 = {'topKLimit' : 5, 'metric' : 'runs', 'intent' : 'topk'}
+    request3 = {'intent' : 'topk', 'metric' : 'runs', 'topKLimit' : 3}
+
+    key1 = result_cache.request_key(request1, 'fingerprint')
+    key2 = result_cache.request_key(request2, 'fingerprint')
+    key3 = result_cache.request_key(request3, 'fingerprint')
+    key4 = result_cache.request_key(request2, 'other fingerprint')
+
+    assert(key1 == key2)
+    assert(key1 != key3)
+    assert(key1 != key4)
+
+    assert(result_cache.get(key1) is None)
+    result_cache.put(key1, 'response')
+    assert(result_cache.get(key2) == 'response')
+
+    print(result_cache.stats())
+
+    assert(result_cache.stats() == {'hits' : 1, 'misses' : 1, 'size' : 1})
+
+def test_2():
+    """
+    Responses older than the TTL are not returned, and only the most
+    recently used responses are kept when the cache is full.
+    """
+    result_cache.clear()
+
+    default_ttl = result_cache.RESULT_CACHE_TTL
+    default_max_entries = result_cache.RESULT_CACHE_MAX_ENTRIES
+
+    result_cache.RESULT_CACHE_TTL = -1
+    result_cache.put('key', 'response')
+    assert(result_cache.get('key') is None)
+
+    result_cache.RESULT_CACHE_TTL = default_ttl
+    result_cache.RESULT_CACHE_MAX_ENTRIES = 2
+
+    result_cache.put('key1', 'response1')
+    result_cache.put('key2', 'response2')
+    result_cache.get('key1')
+    result_cache.put('key3', 'response3')
+
+    result_cache.RESULT_CACHE_MAX_ENTRIES = default_max_entries
+
+    assert(result_cache.get('key1') == 'response1')
+    assert(result_cache.get('key2') is None)
+    assert(result_cache.get('key3') == 'response3')
+
+print(test_1.__doc__)
+test_1()
+
+print(test_2.__doc__)
+test_2()
+
+print('Test cases completed')